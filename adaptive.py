@@ -0,0 +1,122 @@
+import json
+import math
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from astrbot.api import logger
+
+HISTORY_SIZE = 32
+HOUR_DECAY_THRESHOLD = 200
+
+
+class ActivityModel:
+    """
+    记录每个 UID 近期的动态发布时间，估算发布频率与活跃时段，据此给出轮询间隔。
+    以每天发布 1 条为基准，频率越高间隔越短，长期不发布的 UID 逐渐退避到上限。
+    """
+
+    def __init__(
+        self, path: str, base_secs: float, min_secs: float, max_secs: float
+    ) -> None:
+        self.path = path
+        self.base_secs = base_secs
+        self.min_secs = min(min_secs, max_secs)
+        self.max_secs = max(min_secs, max_secs)
+        # 全局预算不足时对所有间隔整体放大的系数
+        self.scale = 1.0
+        self._uids: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._uids = data.get("uids", {})
+        except Exception as e:
+            logger.warning(f"加载轮询活跃度模型失败，将重新学习: {e}")
+            self._uids = {}
+
+    def save(self) -> None:
+        """写回磁盘，无变更时跳过。"""
+        if not self._dirty:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"uids": self._uids}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"保存轮询活跃度模型失败: {e}")
+
+    def observe(self, uid: int, items: Iterable[Dict[str, Any]]) -> None:
+        """从动态列表中提取发布时间（忽略置顶）并更新模型。"""
+        entry = self._uids.setdefault(str(uid), {"pub_ts": [], "hours": [0] * 24})
+        known = set(entry["pub_ts"])
+        added = False
+        for item in items or []:
+            modules = item.get("modules") or {}
+            if (modules.get("module_tag") or {}).get("text") == "置顶":
+                continue
+            try:
+                pub_ts = int((modules.get("module_author") or {}).get("pub_ts"))
+            except (TypeError, ValueError):
+                continue
+            if pub_ts in known:
+                continue
+            known.add(pub_ts)
+            entry["pub_ts"].append(pub_ts)
+            entry["hours"][time.localtime(pub_ts).tm_hour] += 1
+            added = True
+
+        if not added:
+            return
+        entry["pub_ts"] = sorted(entry["pub_ts"])[-HISTORY_SIZE:]
+        if sum(entry["hours"]) > HOUR_DECAY_THRESHOLD:
+            entry["hours"] = [count // 2 for count in entry["hours"]]
+        self._dirty = True
+
+    def forget(self, uids: Iterable[int]) -> None:
+        for uid in uids:
+            if self._uids.pop(str(uid), None) is not None:
+                self._dirty = True
+
+    def raw_interval(self, uid: int, now: Optional[float] = None) -> float:
+        """按活跃度估算的轮询间隔（未计入全局预算），单位秒。"""
+        entry = self._uids.get(str(uid))
+        if not entry or not entry["pub_ts"]:
+            return self._clamp(self.base_secs)
+
+        now = now or time.time()
+        stamps: List[int] = entry["pub_ts"]
+        span_days = max(now - stamps[0], 3600) / 86400
+        posts_per_day = len(stamps) / span_days
+
+        hours = entry["hours"]
+        mean = sum(hours) / 24
+        hour_weight = (hours[time.localtime(now).tm_hour] + 1) / (mean + 1)
+
+        rate = max(posts_per_day * hour_weight, 1e-6)
+        return self._clamp(self.base_secs * math.sqrt(1 / rate))
+
+    def interval(self, uid: int, now: Optional[float] = None) -> float:
+        """计入全局预算后的轮询间隔，单位秒。"""
+        return self._clamp(self.raw_interval(uid, now) * self.scale)
+
+    def rebalance(self, uids: Iterable[int], budget_rps: float) -> None:
+        """
+        根据全局预算（每秒请求数）计算间隔放大系数，使总请求速率不超过预算。
+        """
+        if budget_rps <= 0:
+            self.scale = 1.0
+            return
+        now = time.time()
+        demand = sum(1 / self.raw_interval(uid, now) for uid in uids)
+        self.scale = max(1.0, demand / budget_rps)
+
+    def _clamp(self, secs: float) -> float:
+        return min(max(secs, self.min_secs), self.max_secs)
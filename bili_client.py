@@ -1,10 +1,109 @@
-from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 import aiohttp
 from astrbot.api import logger
-from bilibili_api import Credential, request_settings, user, video
+from bilibili_api import Credential, dynamic, request_settings, user, video
+from bilibili_api.utils import network
 from bilibili_api.utils.network import Api
 
+from .cache import TTLCache
+from .concurrency import SingleFlight
+from .proxy_pool import ProxyPool, RoutedSession, current_proxy
+
+
+# 风控相关的业务错误码：-352 风控校验失败，-412 请求被拦截，-509/-799 请求过于频繁
+RISK_CODES = {-352, -412, -509, -799}
+RISK_HTTP_STATUS = {412, 429}
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# 登录账号相关请求的路由键，固定走同一代理，避免账号在多个 IP 间频繁切换
+ACCOUNT_ROUTE = "account"
+
+# 关注动态流请求的 features，与用户空间动态接口保持一致，保证两处返回的动态结构相同
+FEED_FEATURES = "itemOpusStyle,listOnlyfans,opusBigCover,onlyfansVote,forwardListHidden,decorationCard,commentsNewVersion,onlyfansAssetsV2,ugcDelete,onlyfansQaCard"
+
+
+class RiskController:
+    """
+    风控感知的 AIMD 速率控制器。
+    检测到风控响应时成倍降低请求速率并熔断一段时间（连续触发时冷却时间翻倍），
+    响应恢复正常后按固定步长逐步回升。
+    """
+
+    def __init__(
+        self,
+        decrease: float = 0.5,
+        increase: float = 0.05,
+        min_factor: float = 0.05,
+        cooldown_secs: float = 60,
+        max_cooldown_secs: float = 1800,
+    ) -> None:
+        self.decrease = decrease
+        self.increase = increase
+        self.min_factor = min_factor
+        self.cooldown_secs = cooldown_secs
+        self.max_cooldown_secs = max_cooldown_secs
+        # 当前速率系数，1 表示按配置的全速运行
+        self.factor = 1.0
+        self.open_until = 0.0
+        self.trips = 0
+        self.risk_events = 0
+        self.last_reason = ""
+        self.last_risk_at: Optional[float] = None
+
+    @staticmethod
+    def classify(e: BaseException) -> Optional[str]:
+        """
+        判断异常是否为风控响应，是则返回原因描述。
+        """
+        code = getattr(e, "code", None)
+        if code in RISK_CODES:
+            return f"code {code}"
+        status = getattr(e, "status", None)
+        if status in RISK_HTTP_STATUS:
+            return f"HTTP {status}"
+        return None
+
+    def is_open(self) -> bool:
+        """熔断是否处于打开状态（冷却中）。"""
+        return time.monotonic() < self.open_until
+
+    def retry_after(self) -> float:
+        """距离熔断结束的秒数。"""
+        return max(self.open_until - time.monotonic(), 0)
+
+    def record_success(self) -> None:
+        self.trips = 0
+        self.factor = min(1.0, self.factor + self.increase)
+
+    def record_risk(self, reason: str) -> None:
+        cooldown = min(self.cooldown_secs * (2**self.trips), self.max_cooldown_secs)
+        self.trips += 1
+        self.risk_events += 1
+        self.factor = max(self.min_factor, self.factor * self.decrease)
+        self.open_until = time.monotonic() + cooldown
+        self.last_reason = reason
+        self.last_risk_at = time.time()
+        logger.warning(
+            f"检测到 Bilibili 风控响应 ({reason})，请求速率降至 {self.factor:.0%}，暂停请求 {cooldown:.0f} 秒。"
+        )
+
+    def state(self) -> Dict[str, Any]:
+        """当前控制器状态，用于排查吞吐下降原因。"""
+        return {
+            "factor": self.factor,
+            "circuit_open": self.is_open(),
+            "retry_after_secs": self.retry_after(),
+            "consecutive_trips": self.trips,
+            "risk_events": self.risk_events,
+            "last_reason": self.last_reason,
+            "last_risk_at": self.last_risk_at,
+        }
+
 
 class BiliClient:
     """
@@ -16,12 +115,37 @@ class BiliClient:
         sessdata: Optional[str] = None,
         credential_dict: Optional[Dict[str, Any]] = None,
         proxy: Optional[str] = None,
+        transport: Optional[Dict[str, Any]] = None,
+        proxy_pool: Optional[ProxyPool] = None,
     ) -> None:
         """
         初始化 Bilibili API 客户端。
+        transport 为传输层配置：client（请求库，留空自动选择）、http2、pool_size（连接池大小）、timeout_secs（单次请求超时）。
+        proxy_pool 不为空时请求分散到池中各代理，此时 proxy 不再生效。
         """
         self.proxy = (proxy or "").strip()
-        self._apply_proxy()
+        self.proxy_pool = proxy_pool or None
+        self.transport = {
+            "client": "",
+            "http2": True,
+            "pool_size": 32,
+            "timeout_secs": 15,
+            **(transport or {}),
+        }
+        self._transport_ready = False
+        self._configure_transport()
+        self.risk = RiskController()
+        self._session: Optional[aiohttp.ClientSession] = None
+        # b23 短链 -> 解析后的原始链接
+        self._b23_cache: TTLCache[str] = TTLCache(maxsize=1024, ttl_secs=24 * 3600)
+        self._b23_flight = SingleFlight()
+        # 视频详细信息变化较慢，在线人数变化快，分别设置过期时间
+        self._video_info_cache: TTLCache[Dict[str, Any]] = TTLCache(
+            maxsize=512, ttl_secs=600
+        )
+        self._video_online_cache: TTLCache[Dict[str, Any]] = TTLCache(
+            maxsize=512, ttl_secs=60
+        )
         self.credential = None
         if credential_dict:
             self.credential = self._build_credential(credential_dict)
@@ -30,14 +154,96 @@ class BiliClient:
         else:
             logger.warning("未提供 SESSDATA 或 凭据，部分需要登录的API可能无法使用。")
 
-    def _apply_proxy(self) -> None:
+    def _configure_transport(self) -> None:
         """
-        根据当前配置应用全局请求代理。
+        一次性应用 bilibili_api 的全局传输配置：请求库、代理、超时与 HTTP/2。
         """
+        client = self.transport["client"]
+        try:
+            if client and client != network.get_selected_client()[0]:
+                network.select_client(client)
+        except Exception as e:
+            logger.warning(f"切换请求库 {client} 失败，使用默认请求库: {e}")
+        if self.proxy_pool and network.get_selected_client()[0] != "aiohttp":
+            # 只有 aiohttp 能为单个请求指定代理，其余请求库的代理对整个事件循环生效
+            logger.warning("代理池需要使用 aiohttp 请求库，已改为只使用代理池中的第一个代理")
+            self.proxy = self.proxy_pool.proxies[0]
+            self.proxy_pool = None
         try:
             request_settings.set_proxy(self.proxy)
+            request_settings.set_timeout(float(self.transport["timeout_secs"]))
+            if "http2" in network.get_available_settings():
+                request_settings.set("http2", bool(self.transport["http2"]))
         except Exception as e:
-            logger.warning(f"设置 Bilibili 请求代理失败: {e}")
+            logger.warning(f"设置 Bilibili 请求参数失败: {e}")
+
+    async def _ensure_transport(self) -> None:
+        """
+        首次请求时为当前事件循环安装复用连接的会话（仅 aiohttp）：
+        限制连接池大小、开启 keep-alive 与 DNS 缓存。curl_cffi/httpx 自带连接复用，只需上面的全局配置。
+        """
+        if self._transport_ready:
+            return
+        self._transport_ready = True
+        try:
+            if network.get_selected_client()[0] != "aiohttp":
+                return
+            previous = network.get_client()
+            connector = aiohttp.TCPConnector(
+                limit=int(self.transport["pool_size"]),
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            )
+            session = aiohttp.ClientSession(connector=connector, trust_env=True)
+            if self.proxy_pool:
+                network.set_session(RoutedSession(session, self.proxy_pool))
+            else:
+                network.set_session(session)
+            # 自定义会话需重新设置代理与超时，才会在每次请求时生效
+            client = network.get_client()
+            client.set_proxy(self.proxy)
+            client.set_timeout(float(self.transport["timeout_secs"]))
+            await previous.close()
+        except Exception as e:
+            logger.warning(f"初始化 Bilibili 请求连接池失败，使用默认会话: {e}")
+
+    @contextmanager
+    def _route(self, key: Any = None) -> Iterator[None]:
+        """
+        为其中发起的请求从代理池选择代理，key 相同的请求固定走同一代理。未配置代理池时不做处理。
+        """
+        if not self.proxy_pool:
+            yield
+            return
+        proxy = self.proxy_pool.acquire(key)
+        token = current_proxy.set(proxy)
+        try:
+            yield
+        finally:
+            current_proxy.reset(token)
+            self.proxy_pool.release(proxy)
+
+    def _observe_error(self, e: BaseException) -> bool:
+        """
+        将异常交给风控控制器分类，返回是否为风控响应。
+        使用代理池时先剔除触发风控的代理，仍有可用代理时不触发全局熔断。
+        """
+        reason = RiskController.classify(e)
+        if reason:
+            proxy = current_proxy.get()
+            if (
+                self.proxy_pool
+                and proxy is not None
+                and self.proxy_pool.record_risk(proxy, reason)
+            ):
+                return True
+            self.risk.record_risk(reason)
+            return True
+        return False
+
+    def proxy_stats(self) -> List[Dict[str, Any]]:
+        """代理池中各代理的状态，未配置代理池时为空。"""
+        return self.proxy_pool.stats() if self.proxy_pool else []
 
     def _build_credential(self, credential_data: Dict[str, Any]) -> Credential:
         """
@@ -119,29 +325,190 @@ class BiliClient:
         """
         return user.User(uid=uid, credential=self.credential)
 
-    async def get_video_info(self, bvid: str) -> Optional[Dict[str, Any]]:
+    async def get_video_info(
+        self, bvid: str, with_online: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """
         获取视频的详细信息和在线观看人数。
+        详细信息与在线人数分别缓存，缺失的部分并发请求；with_online 为 False 时不请求在线人数，online 为 None。
         """
-        try:
-            v = video.Video(bvid=bvid)
-            info = await v.get_info()
-            online = await v.get_online()
-            return {"info": info, "online": online}
-        except Exception as e:
-            logger.error(f"获取视频信息失败 (BVID: {bvid}): {e}")
+        # BV 号正文为区分大小写的 base58，只统一前缀的大小写
+        key = "BV" + bvid[2:]
+        info = self._video_info_cache.get(key)
+        online = self._video_online_cache.get(key) if with_online else None
+        await self._ensure_transport()
+        with self._route():
+            try:
+                v = video.Video(bvid=bvid)
+                fetch_info = v.get_info() if info is None else None
+                fetch_online = v.get_online() if with_online and online is None else None
+                pending = [coro for coro in (fetch_info, fetch_online) if coro]
+                if pending:
+                    results = iter(await asyncio.gather(*pending))
+                    if fetch_info:
+                        info = next(results)
+                        self._video_info_cache.set(key, info)
+                    if fetch_online:
+                        online = next(results)
+                        self._video_online_cache.set(key, online)
+                return {"info": info, "online": online}
+            except Exception as e:
+                logger.error(f"获取视频信息失败 (BVID: {bvid}): {e}")
+                return None
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """各缓存的命中统计。"""
+        return {
+            "video_info": self._video_info_cache.stats(),
+            "video_online": self._video_online_cache.stats(),
+            "b23": self._b23_cache.stats(),
+        }
+
+    async def get_latest_dynamics(
+        self, uid: int, offset: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """
+        获取用户的最新动态，offset 为上一页返回的 offset，留空获取第一页。
+        """
+        if self.risk.is_open():
+            logger.debug(f"风控冷却中，跳过获取用户动态 (UID: {uid})")
+            return None
+        with self._route(uid):
+            try:
+                await self._ensure_transport()
+                u: user.User = await self.get_user(uid)
+                dyn = await u.get_dynamics_new(offset)
+            except Exception as e:
+                self._observe_error(e)
+                logger.error(f"获取用户动态失败 (UID: {uid}): {e}")
+                return None
+        self.risk.record_success()
+        return dyn
+
+    async def get_self_mid(self) -> Optional[int]:
+        """
+        获取当前登录账号的 UID。
+        """
+        if not self.credential:
+            return None
+        if self.credential.dedeuserid:
+            try:
+                return int(self.credential.dedeuserid)
+            except (TypeError, ValueError):
+                pass
+        if self.risk.is_open():
             return None
+        with self._route(ACCOUNT_ROUTE):
+            try:
+                await self._ensure_transport()
+                info = await user.get_self_info(self.credential)
+            except Exception as e:
+                self._observe_error(e)
+                logger.error(f"获取登录账号信息失败: {e}")
+                return None
+        self.risk.record_success()
+        return info.get("mid")
+
+    async def get_followings(self, mid: int) -> Optional[Set[int]]:
+        """
+        获取账号关注的全部 UID（需为登录账号本人，否则只能获取前 5 页）。
+        """
+        if self.risk.is_open():
+            return None
+        u = user.User(uid=mid, credential=self.credential)
+        followings: Set[int] = set()
+        page = 1
+        with self._route(ACCOUNT_ROUTE):
+            try:
+                await self._ensure_transport()
+                while True:
+                    resp = await u.get_followings(pn=page, ps=50)
+                    entries = resp.get("list") or []
+                    followings.update(int(entry["mid"]) for entry in entries)
+                    if not entries or len(followings) >= resp.get("total", 0):
+                        break
+                    page += 1
+            except Exception as e:
+                self._observe_error(e)
+                logger.error(f"获取关注列表失败 (UID: {mid}): {e}")
+                return None
+        self.risk.record_success()
+        return followings
 
-    async def get_latest_dynamics(self, uid: int) -> Optional[Dict[str, Any]]:
+    async def get_follow_feed(
+        self, offset: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         """
-        获取用户的最新动态。
+        获取登录账号的关注动态流（全部类型），offset 为上一页返回的 offset。
         """
+        if not self.credential or self.risk.is_open():
+            return None
+        with self._route(ACCOUNT_ROUTE):
+            try:
+                await self._ensure_transport()
+                feed = await dynamic.get_dynamic_page_info(
+                    self.credential,
+                    _type=dynamic.DynamicType.ALL,
+                    features=FEED_FEATURES,
+                    offset=offset,
+                )
+            except Exception as e:
+                self._observe_error(e)
+                logger.error(f"获取关注动态流失败: {e}")
+                return None
+        self.risk.record_success()
+        return feed
+
+    async def follow_user(self, uid: int) -> bool:
+        """
+        使用登录账号关注 UP 主，需要凭据中包含 bili_jct。
+        """
+        if not self.credential or self.risk.is_open():
+            return False
+        with self._route(ACCOUNT_ROUTE):
+            try:
+                await self._ensure_transport()
+                u = user.User(uid=uid, credential=self.credential)
+                await u.modify_relation(user.RelationType.SUBSCRIBE)
+            except Exception as e:
+                self._observe_error(e)
+                logger.error(f"关注 UP 主失败 (UID: {uid}): {e}")
+                return False
+        self.risk.record_success()
+        return True
+
+    async def get_follow_feed_update_num(self, baseline: str) -> Optional[int]:
+        """
+        查询关注动态流中比 baseline 更新的动态条数，响应只有一个数字，开销远小于拉取动态列表。
+        """
+        if not self.credential or self.risk.is_open():
+            return None
+        API_CONFIG = {
+            "url": "https://api.bilibili.com/x/polymer/web-dynamic/v1/feed/all/update",
+            "method": "GET",
+            "verify": True,
+            "params": {
+                "type": "str: 动态分类类型",
+                "update_baseline": "str: 基准动态 ID",
+            },
+            "comment": "查询关注动态流的新动态数",
+        }
+        with self._route(ACCOUNT_ROUTE):
+            try:
+                await self._ensure_transport()
+                resp = (
+                    await Api(**API_CONFIG, credential=self.credential)
+                    .update_params(type="all", update_baseline=baseline)
+                    .result
+                )
+            except Exception as e:
+                self._observe_error(e)
+                logger.error(f"查询关注动态更新数失败: {e}")
+                return None
+        self.risk.record_success()
         try:
-            self._apply_proxy()
-            u: user.User = await self.get_user(uid)
-            return await u.get_dynamics_new()
-        except Exception as e:
-            logger.error(f"获取用户动态失败 (UID: {uid}): {e}")
+            return int(resp.get("update_num", 0))
+        except (AttributeError, TypeError, ValueError):
             return None
 
     async def get_live_info(self, uid: int) -> Optional[Dict[str, Any]]:
@@ -149,16 +516,27 @@ class BiliClient:
         获取用户的直播间信息。
         DEPRECATED: 该方法已弃用，据反馈易引起412错误
         """
-        try:
-            u: user.User = await self.get_user(uid)
-            # 上游接口同u.get_user_info，即"https://api.bilibili.com/x/space/wbi/acc/info"，412的诱因
-            return await u.get_live_info()
-        except Exception as e:
-            logger.error(f"获取直播间信息失败 (UID: {uid}): {e}")
-            return None
+        await self._ensure_transport()
+        with self._route(uid):
+            try:
+                u: user.User = await self.get_user(uid)
+                # 上游接口同u.get_user_info，即"https://api.bilibili.com/x/space/wbi/acc/info"，412的诱因
+                return await u.get_live_info()
+            except Exception as e:
+                logger.error(f"获取直播间信息失败 (UID: {uid}): {e}")
+                return None
 
-    async def get_live_info_by_uids(self, uids: list[int]) -> Optional[Dict[str, Any]]:
-        self._apply_proxy()
+    async def get_live_info_by_uids(
+        self, uids: list[int]
+    ) -> Optional[Dict[int, Dict[str, Any]]]:
+        """
+        批量获取主播的直播间状态，返回 UID -> 直播间信息 的映射。
+        没有直播间的 UID 不会出现在结果中。
+        """
+        if self.risk.is_open():
+            logger.debug("风控冷却中，跳过获取直播间状态")
+            return None
+        await self._ensure_transport()
         API_CONFIG = {
             "url": "https://api.live.bilibili.com/room/v1/Room/get_status_info_by_uids",
             "method": "GET",
@@ -167,45 +545,126 @@ class BiliClient:
             "comment": "通过主播uid列表获取直播间状态信息（是否在直播、房间号等）",
         }
         params: Dict[str, list[int]] = {"uids[]": uids}
-        resp = await Api(**API_CONFIG, no_csrf=True).update_params(**params).result
+        with self._route():
+            try:
+                resp = await Api(**API_CONFIG, no_csrf=True).update_params(**params).result
+            except Exception as e:
+                self._observe_error(e)
+                raise
+        self.risk.record_success()
         if not isinstance(resp, dict) or not resp:
             return None
-        live_room = next(iter(resp.values()))
-        return live_room
+        live_rooms: Dict[int, Dict[str, Any]] = {}
+        for uid, live_room in resp.items():
+            try:
+                live_rooms[int(uid)] = live_room
+            except (TypeError, ValueError):
+                continue
+        return live_rooms
+
+    async def get_user_cards(self, uids: list[int]) -> Optional[Dict[int, Dict[str, Any]]]:
+        """
+        批量获取用户名片（昵称、头像、性别），返回 UID -> 名片 的映射。
+        """
+        if self.risk.is_open():
+            return None
+        await self._ensure_transport()
+        API_CONFIG = {
+            "url": "https://api.vc.bilibili.com/account/v1/user/cards",
+            "method": "GET",
+            "verify": False,
+            "params": {"uids": "str: 逗号分隔的 UID 列表"},
+            "comment": "批量获取用户名片",
+        }
+        with self._route():
+            try:
+                resp = (
+                    await Api(**API_CONFIG, no_csrf=True)
+                    .update_params(uids=",".join(str(uid) for uid in uids))
+                    .result
+                )
+            except Exception as e:
+                self._observe_error(e)
+                logger.error(f"批量获取用户名片失败: {e}")
+                return None
+        self.risk.record_success()
+        cards: Dict[int, Dict[str, Any]] = {}
+        for card in resp or []:
+            try:
+                cards[int(card["mid"])] = card
+            except (KeyError, TypeError, ValueError):
+                continue
+        return cards
 
     async def get_user_info(self, uid: int) -> Tuple[Dict[str, Any] | None, str]:
         """
         获取用户的基本信息。
         """
-        try:
-            u: user.User = await self.get_user(uid)
-            info = await u.get_user_info()
-            return info, ""
-        except Exception as e:
-            if "code" in e.args[0] and e.args[0]["code"] == -404:
-                logger.warning(f"无法找到用户 (UID: {uid})")
-                return None, "啥都木有 (´;ω;`)"
-            else:
-                logger.error(f"获取用户信息失败 (UID: {uid}): {e}")
-                return None, f"获取 UP 主信息失败: {str(e)}"
+        if self.risk.is_open():
+            return None, "触发 B 站风控，请求暂停中，请稍后再试"
+        await self._ensure_transport()
+        with self._route(uid):
+            try:
+                u: user.User = await self.get_user(uid)
+                info = await u.get_user_info()
+                self.risk.record_success()
+                return info, ""
+            except Exception as e:
+                if self._observe_error(e):
+                    logger.error(f"获取用户信息触发风控 (UID: {uid}): {e}")
+                    return None, f"获取 UP 主信息失败: {str(e)}"
+                if "code" in e.args[0] and e.args[0]["code"] == -404:
+                    logger.warning(f"无法找到用户 (UID: {uid})")
+                    return None, "啥都木有 (´;ω;`)"
+                else:
+                    logger.error(f"获取用户信息失败 (UID: {uid}): {e}")
+                    return None, f"获取 UP 主信息失败: {str(e)}"
 
-    async def b23_to_bv(self, url: str) -> Optional[str]:
+    async def _get_session(self) -> aiohttp.ClientSession:
         """
-        b23短链转换为原始链接
+        获取复用的 HTTP 会话，连接池与 TLS 连接在多次请求间共享。
         """
-        headers: Dict[str, str] = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        async with aiohttp.ClientSession() as session:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={"User-Agent": USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(ttl_dns_cache=300, keepalive_timeout=60),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """关闭复用的 HTTP 会话与 bilibili_api 的连接池。"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._transport_ready:
+            # 释放 bilibili_api 当前事件循环的连接池，下次请求时重新安装
+            self._transport_ready = False
             try:
-                async with session.get(
-                    url=url, headers=headers, allow_redirects=False, timeout=10
-                ) as response:
-                    if 300 <= response.status < 400:
-                        location_url: str | None = response.headers.get("Location")
-                        if location_url:
-                            base_url: str = location_url.split("?", 1)[0]
-                            return base_url
+                await network.get_client().close()
             except Exception as e:
-                logger.error(f"解析b23链接失败 (URL: {url}): {e}")
-                return url
+                logger.warning(f"关闭 Bilibili 请求连接池失败: {e}")
+
+    async def b23_to_bv(self, url: str) -> Optional[str]:
+        """
+        b23短链转换为原始链接。解析结果按短链缓存，同一短链的并发解析只请求一次。
+        """
+        key = url.split("?", 1)[0].rstrip("/")
+        cached = self._b23_cache.get(key)
+        if cached is not None:
+            return cached
+        return await self._b23_flight.do(key, lambda: self._resolve_b23(key, url))
+
+    async def _resolve_b23(self, key: str, url: str) -> Optional[str]:
+        session = await self._get_session()
+        try:
+            async with session.get(url=url, allow_redirects=False) as response:
+                if 300 <= response.status < 400:
+                    location_url: str | None = response.headers.get("Location")
+                    if location_url:
+                        base_url: str = location_url.split("?", 1)[0]
+                        self._b23_cache.set(key, base_url)
+                        return base_url
+        except Exception as e:
+            logger.error(f"解析b23链接失败 (URL: {url}): {e}")
+            return url
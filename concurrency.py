@@ -0,0 +1,85 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    令牌桶限流器，供多个协程共享同一份请求预算。
+    rate 为每秒补充的令牌数，burst 为桶容量；rate <= 0 时不限流。
+    rate_scale 可选，返回 (0, 1] 的系数，用于在运行时按比例压低速率。
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1,
+        rate_scale: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self.rate = rate
+        self.rate_scale = rate_scale
+        self.burst = max(float(burst), 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    @property
+    def effective_rate(self) -> float:
+        if self.rate_scale is None:
+            return self.rate
+        return self.rate * self.rate_scale()
+
+    def _refill(self, now: float, rate: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * rate)
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """
+        获取令牌，令牌不足时按先来后到排队等待。
+        """
+        if not self.enabled:
+            return
+        async with self._lock:
+            while True:
+                rate = self.effective_rate
+                self._refill(time.monotonic(), rate)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / rate)
+
+
+class SingleFlight:
+    """
+    合并同一键的并发调用：首个调用者执行，其余调用者等待同一结果。
+    执行在独立任务中进行，个别等待者被取消不会影响其他等待者。
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._finish(key, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 所有等待者都已取消时，避免出现未读取异常的警告
+        if not task.cancelled():
+            task.exception()
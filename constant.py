@@ -11,6 +11,10 @@ def _asset_path(*parts: str) -> str:
 
 LOGO_PATH = _asset_path("Astrbot.png")
 BANNER_PATH = _asset_path("banner.png")
+# 渲染数据中的静态资源占位符，渲染时才替换为 Base64，不随渲染数据写入发件箱
+BANNER_ASSET = "asset:banner"
+LOGO_ASSET = "asset:logo"
+ASSET_PATHS = {BANNER_ASSET: BANNER_PATH, LOGO_ASSET: LOGO_PATH}
 BV = r"(?:\?.*)?(?:https?:\/\/)?(?:www\.)?(?:bilibili\.com\/video\/(BV[a-zA-Z0-9]+)|b23\.tv\/([a-zA-Z0-9]+))\/?(?:\?.*)?|BV[a-zA-Z0-9]+"
 VALID_FILTER_TYPES = {
     "forward",
@@ -21,9 +25,22 @@ VALID_FILTER_TYPES = {
     "live",
     "forward_lottery",
 }
+# 支持推送的动态类型，其余类型不推送，但会记为已读，避免落在已读窗口内时每轮都被当作新动态
+SUPPORTED_DYNAMIC_TYPES = frozenset(
+    {
+        "DYNAMIC_TYPE_FORWARD",
+        "DYNAMIC_TYPE_DRAW",
+        "DYNAMIC_TYPE_WORD",
+        "DYNAMIC_TYPE_AV",
+        "DYNAMIC_TYPE_ARTICLE",
+    }
+)
+# 同时包含这些类型时，该订阅不会推送任何动态
+DYNAMIC_FILTER_TYPES = frozenset({"forward", "video", "article", "draw"})
 DATA_PATH = "data/astrbot_plugin_bilibili.json"
 DEFAULT_CFG = {
-    "bili_sub_list": {},  # sub_user -> [{"uid": "uid", "last": "last_dynamic_id", ...}]
+    "bili_sub_list": {},  # sub_user -> [{"uid": uid, "filter_types": [...], ...}]
+    "uid_seen": {},  # uid -> {"max": 最大已读动态 ID, "ids": [最近已读的动态 ID]}
     "credential": None,
 }
 
@@ -69,7 +86,8 @@ def get_template_names() -> list:
 
 MAX_ATTEMPTS = 3
 RETRY_DELAY = 2
-RECENT_DYNAMIC_CACHE = 4
+# 每个 UID 保留的最近已读动态 ID 数
+SEEN_DYNAMIC_WINDOW = 64
 
 category_mapping = {
     "全部": "ALL",
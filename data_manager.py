@@ -1,11 +1,30 @@
-import json
+import asyncio
+import bisect
+import operator
 import os
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from astrbot.api import logger
 from astrbot.api.star import StarTools
 
-from .constant import DATA_PATH, DEFAULT_CFG, RECENT_DYNAMIC_CACHE
+from .constant import (
+    DATA_PATH,
+    DYNAMIC_FILTER_TYPES,
+    SEEN_DYNAMIC_WINDOW,
+)
+from .storage import (
+    ALL_KEY,
+    CREDENTIAL_KEY,
+    SEEN_KEY,
+    Journal,
+    JsonStorage,
+    SqliteStorage,
+)
+
+# 追加日志超过该条数或距上次合并超过该时长时，合并进主存储
+JOURNAL_COMPACT_RECORDS = 1000
+JOURNAL_COMPACT_SECS = 600
 
 
 class DataManager:
@@ -13,7 +32,12 @@ class DataManager:
     负责管理插件的订阅数据，包括加载、保存和修改。
     """
 
-    def __init__(self):
+    def __init__(self, flush_secs: float = 2.0, backend: str = "json"):
+        """
+        高频的状态更新（最新动态 ID、直播状态）追加写入日志文件，定期合并进主存储；
+        flush_secs 为日志落盘（fsync）与其他延迟写回的合并窗口，为 0 时每次修改立即落盘。
+        backend 为存储后端：json（单个 JSON 文件）或 sqlite（按行更新）。
+        """
         standard_data_path = os.path.join(
             StarTools.get_data_dir(plugin_name="astrbot_plugin_bilibili"),
             "astrbot_plugin_bilibili.json",
@@ -26,26 +50,345 @@ class DataManager:
                     dst.write(src.read())
             logger.info(f"已将旧数据文件迁移到标准路径: {standard_data_path}")
         self.path = standard_data_path
-        self.data = self._load_data()
+        if backend == "sqlite":
+            self._storage = SqliteStorage(
+                os.path.splitext(standard_data_path)[0] + ".db",
+                standard_data_path,
+                normalize=self._normalize_data,
+            )
+        else:
+            self._storage = JsonStorage(standard_data_path)
+        self.data = self._storage.load()
+        self.flush_secs = max(flush_secs, 0)
+        # 待写回的数据键，见 storage 模块
+        self._dirty: Set[Any] = set()
+        # 只记录在日志中、尚未合并进主存储的数据键
+        self._journaled: Set[Any] = set()
+        self._journal = Journal(os.path.splitext(standard_data_path)[0] + ".journal")
+        self._journal_unsynced = False
+        self._compacted_at = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+        # 订阅集合的变更计数，监听器据此判断是否需要刷新调度目标
+        self.version = 0
+        self.changed = asyncio.Event()
+        # UID -> [(sub_user, sub_data)] 反向索引，以及每个 UID 的拉取计划
+        self._uid_targets: Dict[int, List[Tuple[str, Dict[str, Any]]]] = {}
+        self._uid_plans: Dict[int, Dict[str, bool]] = {}
+        self._changed_uids: Set[int] = set()
+        # (sub_user, UID) -> sub_data 索引，订阅查找为常数时间
+        self._sub_index: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        if self._normalize_data(self.data):
+            self._dirty.add(ALL_KEY)
+        self._build_uid_index()
+        self._replay_journal()
+
+    @staticmethod
+    def _normalize_uid(uid: Any) -> Optional[int]:
+        try:
+            return int(uid)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _apply_fields(sub_data: Dict[str, Any], fields: Dict[str, Any]):
+        """更新订阅字段，值为 None 的字段被移除。"""
+        for name, value in fields.items():
+            if value is None:
+                sub_data.pop(name, None)
+            else:
+                sub_data[name] = value
+
+    @classmethod
+    def _normalize_data(cls, data: Dict[str, Any]) -> bool:
+        """
+        将旧数据中以字符串保存的 UID 统一为整数，并合并规范化后重复的订阅（保留先出现的一条）；
+        把旧版本逐订阅保存的 last/recent_ids 转换为按 UID 共享的已读状态。
+        返回数据是否有改动，有改动时在下次写回时保存。SQLite 后端导入 JSON 数据前也调用本方法。
+        """
+        changed = cls._migrate_recent_ids(data)
+        all_subs = data.get("bili_sub_list", {})
+        for sub_user, sub_list in all_subs.items():
+            seen: Set[int] = set()
+            normalized = []
+            for sub_data in sub_list or []:
+                uid = cls._normalize_uid(sub_data.get("uid"))
+                if uid is not None:
+                    if uid in seen:
+                        logger.warning(f"移除 {sub_user} 对 UID {uid} 的重复订阅")
+                        changed = True
+                        continue
+                    seen.add(uid)
+                    if sub_data.get("uid") != uid:
+                        sub_data["uid"] = uid
+                        changed = True
+                normalized.append(sub_data)
+            if sub_list is None or len(normalized) != len(sub_list):
+                all_subs[sub_user] = normalized
+        return changed
+
+    def _replay_journal(self):
+        """
+        启动时重放上次运行未合并的日志，并立即合并进主存储。
+        """
+        records = self._journal.replay()
+        if not records:
+            return
+        keys: Set[Any] = set()
+        for record in records:
+            try:
+                sub_user, uid = record["sub_user"], int(record["uid"])
+                fields = record["set"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            if sub_user == SEEN_KEY:
+                self.data["uid_seen"][str(uid)] = fields
+                keys.add((SEEN_KEY, uid))
+                continue
+            sub = self._sub_index.get((sub_user, uid))
+            if sub is not None:
+                self._apply_fields(sub, fields)
+                keys.add((sub_user, uid))
+        logger.info(f"已重放 {len(records)} 条状态日志")
+        keys |= self._dirty
+        self._storage.write(self._storage.snapshot(self.data, keys))
+        self._dirty.clear()
+        self._journal.rotate()
+        self._journal.discard_rotated()
+
+    @classmethod
+    def _migrate_recent_ids(cls, data: Dict[str, Any]) -> bool:
+        """
+        合并同一 UID 各订阅的 last 与 recent_ids 作为共享的已读状态；
+        已读位置落后于其他订阅的，保留为该订阅自己的 cursor。
+        """
+        seen_states = data.setdefault("uid_seen", {})
+        legacy: List[Tuple[Dict[str, Any], Optional[int], Set[int]]] = []
+        for sub_list in data.get("bili_sub_list", {}).values():
+            for sub_data in sub_list or []:
+                if "last" not in sub_data and "recent_ids" not in sub_data:
+                    continue
+                known = [
+                    sub_data.pop("last", None),
+                    *(sub_data.pop("recent_ids", None) or []),
+                ]
+                ids = {num for num in map(cls._normalize_uid, known) if num is not None}
+                legacy.append((sub_data, cls._normalize_uid(sub_data.get("uid")), ids))
+        if not legacy:
+            return False
+
+        merged: Dict[int, Set[int]] = {}
+        for _, uid, ids in legacy:
+            if uid is not None and ids:
+                merged.setdefault(uid, set()).update(ids)
+        for uid, ids in merged.items():
+            state = seen_states.setdefault(str(uid), {"max": 0, "ids": []})
+            cls._merge_seen(state, ids)
+        for sub_data, uid, ids in legacy:
+            state = seen_states.get(str(uid)) if uid is not None else None
+            if state and ids and max(ids) < state["max"]:
+                sub_data["cursor"] = max(ids)
+        logger.info(f"已将 {len(legacy)} 条订阅的已读记录转换为按 UP 主共享的已读状态")
+        return True
+
+    @staticmethod
+    def _merge_seen(state: Dict[str, Any], ids: Iterable[int]) -> bool:
+        """把动态 ID 并入已读状态，只保留最近的 SEEN_DYNAMIC_WINDOW 个。返回是否有变化。"""
+        window = set(state["ids"])
+        added = {num for num in ids if num not in window}
+        if not added:
+            return False
+        merged = sorted(window | added, reverse=True)[:SEEN_DYNAMIC_WINDOW]
+        if merged == state["ids"]:
+            # 新增的 ID 都早于已满的窗口，本就视为已读
+            return False
+        state["ids"] = merged
+        state["max"] = max(state["max"], merged[0])
+        return True
+
+    def _build_uid_index(self):
+        """
+        根据全部订阅构建 UID 反向索引与 (sub_user, UID) 索引。
+        """
+        self._uid_targets.clear()
+        self._uid_plans.clear()
+        self._sub_index.clear()
+        for sub_user, sub_list in self.get_all_subscriptions().items():
+            for sub_data in sub_list or []:
+                uid = self._normalize_uid(sub_data.get("uid"))
+                if uid is not None:
+                    self._uid_targets.setdefault(uid, []).append((sub_user, sub_data))
+                    self._sub_index[(sub_user, uid)] = sub_data
+        for uid in self._uid_targets:
+            self._refresh_uid_plan(uid)
+
+    def _index_add(self, sub_user: str, sub_data: Dict[str, Any]):
+        uid = self._normalize_uid(sub_data.get("uid"))
+        if uid is None:
+            return
+        self._uid_targets.setdefault(uid, []).append((sub_user, sub_data))
+        self._sub_index[(sub_user, uid)] = sub_data
+        self._refresh_uid_plan(uid)
+
+    def _index_remove(self, sub_user: str, sub_data: Dict[str, Any]):
+        uid = self._normalize_uid(sub_data.get("uid"))
+        if uid is None:
+            return
+        targets = [
+            (user, data)
+            for user, data in self._uid_targets.get(uid, [])
+            if not (user == sub_user and data is sub_data)
+        ]
+        if targets:
+            self._uid_targets[uid] = targets
+        else:
+            self._uid_targets.pop(uid, None)
+            # 已无订阅者的 UID 不再保留已读状态
+            if self.data.get("uid_seen", {}).pop(str(uid), None) is not None:
+                self._dirty.add((SEEN_KEY, uid))
+        if self._sub_index.get((sub_user, uid)) is sub_data:
+            del self._sub_index[(sub_user, uid)]
+        self._refresh_uid_plan(uid)
+
+    def _refresh_uid_plan(self, uid: int):
+        """
+        重新计算 UID 的拉取计划：是否有订阅者需要动态、是否有订阅者需要直播。
+        """
+        targets = self._uid_targets.get(uid)
+        if not targets:
+            self._uid_plans.pop(uid, None)
+        else:
+            needs_dynamics = False
+            needs_live = False
+            for _, sub_data in targets:
+                filter_types = set(sub_data.get("filter_types") or [])
+                if not DYNAMIC_FILTER_TYPES <= filter_types:
+                    needs_dynamics = True
+                if "live" not in filter_types:
+                    needs_live = True
+            self._uid_plans[uid] = {
+                "dynamics": needs_dynamics,
+                "live": needs_live,
+            }
+        self._changed_uids.add(uid)
+        self._mark_changed()
+
+    def _mark_changed(self):
+        """
+        记录一次订阅集合变更，并唤醒等待中的监听器。
+        """
+        self.version += 1
+        self.changed.set()
+
+    def get_uid_targets(self) -> Dict[int, List[Tuple[str, Dict[str, Any]]]]:
+        """
+        获取 UID -> [(sub_user, sub_data)] 反向索引。返回的是内部索引本身，调用方不应修改。
+        """
+        return self._uid_targets
 
-    def _load_data(self) -> Dict[str, Any]:
+    def get_uid_plan(self, uid: int) -> Dict[str, bool]:
         """
-        从 JSON 文件加载数据。如果文件不存在，则创建并使用默认配置。
+        获取 UID 的拉取计划，形如 {"dynamics": True, "live": False}。
         """
-        if not os.path.exists(self.path):
-            logger.info(f"数据文件不存在，将创建于: {self.path}")
-            # 确保目录存在
-            os.makedirs(os.path.dirname(self.path), exist_ok=True)
-            with open(self.path, "w", encoding="utf-8-sig") as f:
-                json.dump(DEFAULT_CFG, f, ensure_ascii=False, indent=4)
-            return DEFAULT_CFG
+        return self._uid_plans.get(uid, {"dynamics": False, "live": False})
 
-        with open(self.path, "r", encoding="utf-8-sig") as f:
-            return json.load(f)
+    def pop_changed_uids(self) -> Set[int]:
+        """
+        取出自上次调用以来索引或拉取计划发生变化的 UID。
+        """
+        changed, self._changed_uids = self._changed_uids, set()
+        return changed
+
+    async def save(self, durable: bool = True, key: Any = ALL_KEY):
+        """
+        保存数据。durable 为 True 时立即写入磁盘后返回；
+        为 False 时只标记待写，由后台在合并窗口结束时统一写入。
+        key 为发生变化的数据，SQLite 后端据此只更新对应的行。
+        """
+        self._dirty.add(key)
+        if durable or self.flush_secs <= 0:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _record(self, sub_user: str, uid: int, fields: Dict[str, Any]):
+        """
+        把订阅字段的新值追加到日志，代替整体写回；日志在合并窗口内统一落盘，积累到一定量后合并进主存储。
+        """
+        self._journal.append({"sub_user": sub_user, "uid": uid, "set": fields})
+        self._journaled.add((sub_user, uid))
+        self._journal_unsynced = True
+        if self.flush_secs <= 0:
+            await self._sync_journal()
+            if self._compaction_due():
+                await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    def _compaction_due(self) -> bool:
+        return bool(self._journaled) and (
+            self._journal.records >= JOURNAL_COMPACT_RECORDS
+            or time.monotonic() - self._compacted_at >= JOURNAL_COMPACT_SECS
+        )
+
+    async def _sync_journal(self):
+        async with self._write_lock:
+            if self._journal_unsynced:
+                self._journal_unsynced = False
+                await asyncio.to_thread(self._journal.sync)
+
+    async def _flush_later(self):
+        # 写入期间产生的新修改在下一个窗口继续写回
+        while self._dirty or self._journal_unsynced or self._compaction_due():
+            await asyncio.sleep(self.flush_secs)
+            try:
+                # 关闭时取消本任务不应打断正在进行的写入
+                if self._dirty or self._compaction_due():
+                    await asyncio.shield(self.flush())
+                else:
+                    await asyncio.shield(self._sync_journal())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"保存订阅数据失败: {e}")
 
-    async def save(self):
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
+    async def flush(self):
+        """
+        将待写的修改连同日志中的状态更新一起写入主存储，写入在线程中进行，不阻塞事件循环。
+        """
+        async with self._write_lock:
+            if not self._dirty and not self._journaled:
+                return
+            keys = self._dirty | self._journaled
+            journaled = self._journaled
+            self._dirty, self._journaled = set(), set()
+            # 在事件循环内复制出一致的快照，序列化与写入都在线程中进行
+            # 写入期间的修改留待下次写回
+            snapshot = self._storage.snapshot(self.data, keys)
+            # 快照已包含当前日志的全部内容，之后的记录写入新日志
+            self._journal.rotate()
+            self._journal_unsynced = False
+            try:
+                await asyncio.to_thread(self._storage.write, snapshot)
+            except Exception:
+                self._dirty |= keys - journaled
+                self._journaled |= journaled
+                raise
+            self._compacted_at = time.monotonic()
+            await asyncio.to_thread(self._journal.discard_rotated)
+
+    async def close(self):
+        """停止后台写回并写入尚未落盘的修改。"""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        await self.flush()
+        self._journal.close()
+        self._storage.close()
 
     def get_all_subscriptions(self) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -66,12 +409,10 @@ class DataManager:
         """
         获取特定用户对特定UP主的订阅信息。
         """
-        user_subs = self.get_subscriptions_by_user(sub_user)
-        if user_subs:
-            for sub in user_subs:
-                if sub.get("uid") == str(uid) or sub.get("uid") == uid:
-                    return sub
-        return None
+        uid_int = self._normalize_uid(uid)
+        if uid_int is None:
+            return None
+        return self._sub_index.get((sub_user, uid_int))
 
     async def add_subscription(self, sub_user: str, sub_data: Dict[str, Any]):
         """
@@ -80,13 +421,17 @@ class DataManager:
         all_subs = self.get_all_subscriptions()
         if sub_user not in all_subs:
             all_subs[sub_user] = []
-        uid = sub_data.get("uid")
+        uid = self._normalize_uid(sub_data.get("uid"))
+        if uid is not None:
+            sub_data["uid"] = uid
         existing = self.get_subscription(sub_user, uid) if uid is not None else None
         if existing:
             existing.update(sub_data)
+            self._refresh_uid_plan(uid)
         else:
             all_subs[sub_user].append(sub_data)
-        await self.save()
+            self._index_add(sub_user, sub_data)
+        await self.save(key=(sub_user, uid))
 
     async def update_subscription(
         self, sub_user: str, uid: int, filter_types: List[str], filter_regex: List[str]
@@ -98,7 +443,8 @@ class DataManager:
         if sub:
             sub["filter_types"] = filter_types
             sub["filter_regex"] = filter_regex
-            await self.save()
+            self._refresh_uid_plan(int(uid))
+            await self.save(key=(sub_user, uid))
             return True
         return False
 
@@ -115,7 +461,7 @@ class DataManager:
         if credential_data is None:
             raise ValueError("credential_data 不能为空")
         self.data["credential"] = credential_data
-        await self.save()
+        await self.save(key=CREDENTIAL_KEY)
 
     async def clear_credential(self):
         """
@@ -123,32 +469,110 @@ class DataManager:
         """
         if "credential" in self.data:
             del self.data["credential"]
-            await self.save()
+            await self.save(key=CREDENTIAL_KEY)
+
+    def get_seen(self, uid: int) -> Optional[Dict[str, Any]]:
+        """UID 的共享已读状态，形如 {"max": 最大已读 ID, "ids": [最近已读 ID，降序]}。"""
+        return self.data.get("uid_seen", {}).get(str(uid))
+
+    def is_seen(
+        self, uid: int, dyn_id: str, sub_data: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        判断动态对订阅是否已读。早于已读窗口的动态视为已读，窗口内未出现过的 ID（如审核后才公开的动态）视为未读；
+        订阅有自己的 cursor（已读位置落后于其他订阅）时，晚于 cursor 的动态对它仍是未读。
+        """
+        num = self._normalize_uid(dyn_id)
+        if num is None:
+            return False
+        cursor = sub_data.get("cursor") if sub_data else None
+        if cursor is not None and num > cursor:
+            return False
+        state = self.get_seen(uid)
+        if not state or not state["ids"]:
+            return cursor is not None
+        ids = state["ids"]
+        if num <= ids[-1]:
+            return True
+        # 窗口按降序保存，取相反数后二分查找
+        index = bisect.bisect_left(ids, -num, key=operator.neg)
+        return index < len(ids) and ids[index] == num
+
+    async def mark_seen(self, uid: int, dyn_ids: Iterable[str]):
+        """把动态记为该 UID 所有订阅已读，一个 UID 只需记录一次，与订阅数无关。"""
+        nums = [num for num in map(self._normalize_uid, dyn_ids) if num is not None]
+        if not nums or int(uid) not in self._uid_targets:
+            return
+        state = self.data.setdefault("uid_seen", {}).setdefault(
+            str(uid), {"max": 0, "ids": []}
+        )
+        if self._merge_seen(state, nums):
+            await self._record(
+                SEEN_KEY, int(uid), {"max": state["max"], "ids": list(state["ids"])}
+            )
+
+    async def seed_subscription(self, sub_user: str, uid: int, dyn_ids: Iterable[str]):
+        """
+        新订阅初始化已读位置，dyn_ids 为订阅时动态列表当前页的 ID。
+        UID 尚无已读状态时用当前页初始化共享状态；已有其他订阅时只给新订阅设置 cursor 到当前页最新动态，
+        不改动共享状态，以免其他订阅尚未推送的动态被记为已读。
+        """
+        sub = self.get_subscription(sub_user, uid)
+        nums = [num for num in map(self._normalize_uid, dyn_ids) if num is not None]
+        if sub is None or not nums:
+            return
+        state = self.get_seen(uid)
+        if not state or not state["ids"]:
+            await self.mark_seen(uid, dyn_ids)
+            return
+        head = max(nums)
+        if head > state["max"]:
+            self._apply_fields(sub, {"cursor": head})
+            await self._record(sub_user, int(uid), {"cursor": head})
+
+    async def hold_cursor(self, sub_user: str, uid: int):
+        """
+        订阅本轮处理失败时调用：在共享已读状态推进前记下它当前的已读位置，之后的动态对它保持未读。
+        """
+        sub = self.get_subscription(sub_user, uid)
+        state = self.get_seen(uid)
+        if sub is None or not state or sub.get("cursor") is not None:
+            return
+        sub["cursor"] = state["max"]
+        await self._record(sub_user, int(uid), {"cursor": state["max"]})
 
     async def update_last_dynamic_id(self, sub_user: str, uid: int, dyn_id: str):
         """
-        更新订阅的最新动态ID。
+        将动态记为已读。共享已读状态按 UID 记录；订阅有自己的 cursor 时一并推进，追上后移除。
         """
         sub = self.get_subscription(sub_user, uid)
-        if sub:
-            sub["last"] = dyn_id
-            history = sub.setdefault("recent_ids", [])
-            if dyn_id:
-                if dyn_id in history:
-                    history.remove(dyn_id)
-                history.insert(0, dyn_id)
-                if len(history) > RECENT_DYNAMIC_CACHE:
-                    del history[RECENT_DYNAMIC_CACHE:]
-            await self.save()
+        if not sub:
+            return
+        await self.mark_seen(uid, [dyn_id])
+        cursor = sub.get("cursor")
+        num = self._normalize_uid(dyn_id)
+        if cursor is None or num is None or num <= cursor:
+            return
+        state = self.get_seen(uid)
+        cursor = None if state and num >= state["max"] else num
+        self._apply_fields(sub, {"cursor": cursor})
+        await self._record(sub_user, int(uid), {"cursor": cursor})
 
-    async def update_live_status(self, sub_user: str, uid: int, is_live: bool):
+    async def update_live_status(
+        self,
+        sub_user: str,
+        uid: int,
+        is_live: bool,
+        live_since: Optional[int] = None,
+    ):
         """
-        更新特定订阅的直播状态。
+        更新特定订阅的直播状态。live_since 为本场直播的开播时间，下播时清除。
         """
         sub = self.get_subscription(sub_user, uid)
         if sub:
-            sub["is_live"] = is_live
-            await self.save()
+            fields = {"is_live": is_live, "live_since": live_since if is_live else None}
+            self._apply_fields(sub, fields)
+            await self._record(sub_user, int(uid), fields)
 
     async def remove_subscription(self, sub_user: str, uid: int) -> bool:
         """
@@ -158,18 +582,14 @@ class DataManager:
         if not user_subs:
             return False
 
-        sub_to_remove = None
-        for sub in user_subs:
-            if sub.get("uid") == str(uid) or sub.get("uid") == uid:
-                sub_to_remove = sub
-                break
-
+        sub_to_remove = self.get_subscription(sub_user, uid)
         if sub_to_remove:
             user_subs.remove(sub_to_remove)
+            self._index_remove(sub_user, sub_to_remove)
             # 如果该用户已无任何订阅，可以选择移除该用户键
             if not user_subs:
                 del self.data["bili_sub_list"][sub_user]
-            await self.save()
+            await self.save(key=(sub_user, int(uid)))
             return True
 
         return False
@@ -189,8 +609,10 @@ class DataManager:
             return msg
 
         if len(candidate) == 1:
-            self.data["bili_sub_list"].pop(candidate[0])
-            await self.save()
+            removed = self.data["bili_sub_list"].pop(candidate[0])
+            for sub_data in removed or []:
+                self._index_remove(candidate[0], sub_data)
+            await self.save(key=(candidate[0], None))
             msg = f"删除 {sid} 订阅成功"
             return msg
 
@@ -0,0 +1,130 @@
+import asyncio
+import traceback
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set
+
+from astrbot.api import logger
+
+
+def platform_of(sub_user: str) -> str:
+    """从 unified_msg_origin（形如 platform:type:session）中取出平台适配器名。"""
+    return sub_user.split(":", 1)[0]
+
+
+def parse_platform_limits(entries: Iterable[str]) -> Dict[str, int]:
+    """解析 "平台:并发数" 形式的配置项，忽略格式不正确的条目。"""
+    limits = {}
+    for entry in entries or []:
+        platform, _, value = str(entry).rpartition(":")
+        try:
+            limit = int(value)
+        except ValueError:
+            logger.warning(f"无效的平台并发配置: {entry}")
+            continue
+        if platform and limit > 0:
+            limits[platform.strip()] = limit
+    return limits
+
+
+class DeliveryPool:
+    """
+    消息投递池。
+    各会话的投递并发进行，同一平台适配器的并发数受信号量限制；
+    单个会话超时或出错只影响自身，同一会话内的投递保持提交顺序。
+    """
+
+    def __init__(
+        self,
+        context: Any,
+        platform_concurrency: int = 5,
+        timeout_secs: float = 60,
+        platform_limits: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.context = context
+        self.platform_concurrency = max(platform_concurrency, 1)
+        self.timeout_secs = timeout_secs
+        self.platform_limits = platform_limits or {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        # 每个会话最后提交的投递任务，新任务排在其后以保证顺序
+        self._tails: Dict[str, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _semaphore(self, platform: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(platform)
+        if semaphore is None:
+            limit = self.platform_limits.get(platform, self.platform_concurrency)
+            semaphore = self._semaphores[platform] = asyncio.Semaphore(limit)
+        return semaphore
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    async def send(self, sub_user: str, message: Any) -> bool:
+        """
+        向会话发送一条消息，占用所属平台的并发名额，超时或失败时记录日志并返回 False。
+        """
+        async with self._semaphore(platform_of(sub_user)):
+            try:
+                if self.timeout_secs > 0:
+                    await asyncio.wait_for(
+                        self.context.send_message(sub_user, message),
+                        self.timeout_secs,
+                    )
+                else:
+                    await self.context.send_message(sub_user, message)
+                return True
+            except asyncio.TimeoutError:
+                logger.error(f"向 {sub_user} 发送消息超时（{self.timeout_secs} 秒）")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"向 {sub_user} 发送消息失败: {e}\n{traceback.format_exc()}"
+                )
+            return False
+
+    def submit(
+        self, sub_user: str, job: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        """
+        在后台执行会话的投递任务，不阻塞调用方。
+        同一会话的任务按提交顺序依次执行，不同会话之间并发。
+        """
+        previous = self._tails.get(sub_user)
+
+        async def run():
+            if previous is not None and not previous.done():
+                try:
+                    await asyncio.shield(previous)
+                except asyncio.CancelledError:
+                    if not previous.cancelled():
+                        raise
+                except Exception:
+                    pass
+            try:
+                await job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"投递到 {sub_user} 时发生错误: {e}\n{traceback.format_exc()}"
+                )
+
+        task = asyncio.create_task(run())
+        self._tails[sub_user] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda t: self._finish(sub_user, t))
+        return task
+
+    def _finish(self, sub_user: str, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if self._tails.get(sub_user) is task:
+            del self._tails[sub_user]
+
+    async def close(self) -> None:
+        """取消尚未完成的投递任务。"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,95 @@
+import re
+from functools import lru_cache
+from typing import List, Optional, Pattern, Sequence, Tuple
+
+from astrbot.api import logger
+
+# 含编号反向引用的正则合并后编号会错位，需单独匹配
+_BACKREF = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def _is_literal(pattern: str) -> bool:
+    return re.escape(pattern) == pattern
+
+
+def find_invalid_patterns(patterns: Sequence[str]) -> List[str]:
+    """
+    返回无法编译的正则表达式，用于订阅时校验。
+    """
+    invalid = []
+    for pattern in patterns:
+        try:
+            re.compile(pattern)
+        except re.error:
+            invalid.append(pattern)
+    return invalid
+
+
+class RegexFilter:
+    """
+    订阅的正则过滤器。
+    纯文本关键词合并为一个多关键词匹配，其余正则尽量合并为单个模式，文本只需扫描一到两次。
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self.patterns: Tuple[str, ...] = tuple(patterns)
+        literals = []
+        regexes = []
+        for pattern in dict.fromkeys(self.patterns):
+            try:
+                re.compile(pattern)
+            except re.error:
+                logger.warning(f"无效的正则表达式: {pattern}")
+                continue
+            if _is_literal(pattern):
+                literals.append(pattern)
+            else:
+                regexes.append(pattern)
+
+        self._literal: Optional[Pattern] = None
+        if literals:
+            # 长关键词优先，保证日志中给出的是最完整的命中项
+            literals.sort(key=len, reverse=True)
+            self._literal = re.compile("|".join(re.escape(p) for p in literals))
+
+        self._combined: Optional[Pattern] = None
+        self._group_patterns: List[str] = []
+        self._separate: List[Tuple[str, Pattern]] = []
+        mergeable = [p for p in regexes if not _BACKREF.search(p)]
+        if mergeable:
+            try:
+                self._combined = re.compile(
+                    "|".join(f"(?P<f{i}>{p})" for i, p in enumerate(mergeable))
+                )
+                self._group_patterns = mergeable
+            except re.error:
+                # 例如含全局内联标志的模式无法合并，退回逐个匹配
+                self._separate.extend((p, re.compile(p)) for p in mergeable)
+        self._separate.extend(
+            (p, re.compile(p)) for p in regexes if _BACKREF.search(p)
+        )
+
+    def search(self, text: str) -> Optional[str]:
+        """返回命中的过滤表达式，未命中时返回 None。"""
+        if self._literal:
+            match = self._literal.search(text)
+            if match:
+                return match.group(0)
+        if self._combined:
+            match = self._combined.search(text)
+            if match:
+                for i, pattern in enumerate(self._group_patterns):
+                    if match.group(f"f{i}") is not None:
+                        return pattern
+        for pattern, compiled in self._separate:
+            if compiled.search(text):
+                return pattern
+        return None
+
+
+@lru_cache(maxsize=4096)
+def get_regex_filter(patterns: Tuple[str, ...]) -> RegexFilter:
+    """
+    获取编译好的过滤器，相同的过滤条件只编译一次。
+    """
+    return RegexFilter(patterns)
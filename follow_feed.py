@@ -0,0 +1,226 @@
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from astrbot.api import logger
+
+from .bili_client import BiliClient
+from .concurrency import TokenBucket
+
+
+def item_author_mid(item: Dict[str, Any]) -> Optional[int]:
+    """动态条目的作者 UID。"""
+    try:
+        return int(item["modules"]["module_author"]["mid"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class FollowFeedProbe:
+    """
+    基于登录账号关注动态流的“有无新动态”探针。
+    B 站没有按单个 UP 主查询是否更新的轻量接口，这里借助关注动态流的 update_baseline：
+    每轮只请求一次只返回新动态条数的接口，有更新时再拉取一页动态流，记录哪些作者出现了新动态 ID。
+    仅对账号已关注的 UID 生效，其余 UID 仍按原方式拉取。
+    关注动态流模式下直接翻页拉取动态流直到上次看到的位置，按作者分发，一轮请求覆盖所有已关注的 UID。
+    """
+
+    def __init__(
+        self,
+        bili_client: BiliClient,
+        limiter: TokenBucket,
+        probe_secs: float = 30,
+        followings_ttl_secs: float = 1800,
+    ) -> None:
+        self.bili_client = bili_client
+        self.limiter = limiter
+        self.probe_secs = probe_secs
+        self.followings_ttl_secs = followings_ttl_secs
+        self.followed: Set[int] = set()
+        self._self_mid: Optional[int] = None
+        self._followings_at = float("-inf")
+        self._checked_at = float("-inf")
+        self._baseline: Optional[str] = None
+        # 关注动态流模式下上次看到的最新动态 ID
+        self._cursor: Optional[str] = None
+        # 探针是否可信：初始化完成且最近一次探测成功
+        self._healthy = False
+        # 动态流中出现、尚未被完整拉取确认的动态 ID
+        self._pending: Dict[int, Set[str]] = {}
+        # 无法从动态流判断、下次必须完整拉取的 UID（新关注或单页装不下的更新）
+        self._dirty: Set[int] = set()
+
+    async def refresh(self) -> None:
+        """距上次探测超过 probe_secs 时探测一次，失败时探针暂时失效，所有 UID 回退为完整拉取。"""
+        now = time.monotonic()
+        if now - self._checked_at < self.probe_secs:
+            return
+        self._checked_at = now
+
+        if now - self._followings_at >= self.followings_ttl_secs:
+            await self._refresh_followings()
+            self._followings_at = now
+        if not self.followed:
+            self._healthy = False
+            return
+
+        if self._baseline is None:
+            await self.limiter.acquire()
+            feed = await self.bili_client.get_follow_feed()
+            self._baseline = (feed or {}).get("update_baseline") or None
+            # 建立基准前的动态无从判断，所有关注的 UID 先完整拉取一次
+            self._dirty |= self.followed
+            self._healthy = self._baseline is not None
+            return
+
+        await self.limiter.acquire()
+        update_num = await self.bili_client.get_follow_feed_update_num(self._baseline)
+        if update_num is None:
+            self._healthy = False
+            return
+        if update_num > 0:
+            await self.limiter.acquire()
+            feed = await self.bili_client.get_follow_feed()
+            if not feed:
+                self._healthy = False
+                return
+            self._record(feed.get("items") or [], update_num)
+            self._baseline = feed.get("update_baseline") or self._baseline
+        self._healthy = True
+
+    async def collect(self, max_pages: int = 5) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        关注动态流模式：翻页拉取上次看到的位置之后的新动态，按作者 UID 分组返回（新动态在前）。
+        超过 max_pages 仍未追到上次位置时，关注的 UID 全部标记为需要完整拉取。
+        """
+        now = time.monotonic()
+        if now - self._followings_at >= self.followings_ttl_secs:
+            await self._refresh_followings()
+            self._followings_at = now
+        if not self.followed:
+            self._healthy = False
+            return {}
+
+        if self._cursor is not None and self._baseline:
+            # 先用轻量接口确认有无更新，无更新时不拉取动态流
+            await self.limiter.acquire()
+            update_num = await self.bili_client.get_follow_feed_update_num(
+                self._baseline
+            )
+            if update_num is None:
+                self._healthy = False
+                return {}
+            if update_num == 0:
+                self._healthy = True
+                return {}
+
+        grouped: Dict[int, List[Dict[str, Any]]] = {}
+        newest: Optional[str] = None
+        baseline: Optional[str] = None
+        reached = self._cursor is None
+        offset: Optional[str] = None
+        for _ in range(max(max_pages, 1)):
+            await self.limiter.acquire()
+            feed = await self.bili_client.get_follow_feed(offset)
+            if not feed:
+                self._healthy = False
+                return grouped
+            if baseline is None:
+                baseline = feed.get("update_baseline")
+            for item in feed.get("items") or []:
+                dyn_id = item.get("id_str")
+                if not dyn_id:
+                    continue
+                if newest is None:
+                    newest = dyn_id
+                if self._cursor is None:
+                    break
+                if _id_not_after(dyn_id, self._cursor):
+                    reached = True
+                    break
+                mid = item_author_mid(item)
+                if mid is not None:
+                    grouped.setdefault(mid, []).append(item)
+            if reached or not feed.get("has_more"):
+                break
+            offset = feed.get("offset")
+            if not offset:
+                break
+
+        if self._cursor is None:
+            # 首次建立位置前的动态无从判断，关注的 UID 先完整拉取一次
+            self._dirty |= self.followed
+        elif not reached:
+            logger.info(
+                f"关注动态流翻页 {max_pages} 页仍未追到上次位置，关注的 UID 将全部完整拉取"
+            )
+            self._dirty |= self.followed
+        if newest is not None:
+            self._cursor = newest
+        self._baseline = baseline or self._baseline
+        self._healthy = self._cursor is not None
+        return grouped
+
+    async def _refresh_followings(self) -> None:
+        if self._self_mid is None:
+            self._self_mid = await self.bili_client.get_self_mid()
+            if self._self_mid is None:
+                return
+        await self.limiter.acquire()
+        followings = await self.bili_client.get_followings(self._self_mid)
+        if followings is None:
+            return
+        # 新关注的 UID 在动态流中没有历史，先完整拉取一次
+        self._dirty |= followings - self.followed
+        self.followed = followings
+
+    def _record(self, items: Iterable[Dict[str, Any]], update_num: int) -> None:
+        recorded = 0
+        for item in items:
+            if recorded >= update_num:
+                break
+            recorded += 1
+            mid = item_author_mid(item)
+            if mid is not None and item.get("id_str"):
+                self._pending.setdefault(mid, set()).add(item["id_str"])
+        if update_num > recorded:
+            logger.info(f"关注动态流有 {update_num} 条更新，超出单页范围，关注的 UID 将全部完整拉取")
+            self._dirty |= self.followed
+
+    def mark_followed(self, uid: int) -> None:
+        """账号新关注了 UID，在其动态出现在动态流之前先完整拉取一次。"""
+        self.followed.add(uid)
+        self._dirty.add(uid)
+
+    def needs_fetch(self, uid: int, is_new: Callable[[str], bool]) -> bool:
+        """
+        判断 UID 是否需要完整拉取动态列表。is_new 判断动态 ID 是否有订阅未读，
+        动态流中出现任一订阅未读的 ID 时需要拉取。
+        """
+        if not self._healthy or uid not in self.followed or uid in self._dirty:
+            return True
+        pending = self._pending.get(uid)
+        if not pending:
+            return False
+        return any(is_new(dyn_id) for dyn_id in pending)
+
+    def pending_ids(self, uid: int) -> Set[str]:
+        return set(self._pending.get(uid, ()))
+
+    def consume(self, uid: int, ids: Set[str]) -> None:
+        """
+        完整拉取过 UID 后清除其待确认状态。ids 为拉取前的 pending_ids，拉取期间新记录的 ID 保留。
+        """
+        pending = self._pending.get(uid)
+        if pending is not None:
+            pending -= ids
+            if not pending:
+                del self._pending[uid]
+        self._dirty.discard(uid)
+
+
+def _id_not_after(dyn_id: str, cursor: str) -> bool:
+    """动态 ID 随发布时间递增，ID 不大于 cursor 说明已追到上次位置。"""
+    try:
+        return int(dyn_id) <= int(cursor)
+    except ValueError:
+        return dyn_id == cursor
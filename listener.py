@@ -1,20 +1,33 @@
 import asyncio
+import os
 import re
 import time
 import traceback
-from collections import OrderedDict
-from typing import Any, Dict, List, Optional, Tuple
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
 from astrbot.api import logger
 from astrbot.api.all import *
 from astrbot.api.event import MessageChain, MessageEventResult
 from astrbot.api.message_components import File, Image, Node, Plain
 
+from .adaptive import ActivityModel
 from .bili_client import BiliClient
-from .constant import BANNER_PATH, LOGO_PATH
+from .concurrency import SingleFlight, TokenBucket
+from .constant import ASSET_PATHS, BANNER_ASSET, LOGO_ASSET, SUPPORTED_DYNAMIC_TYPES
 from .data_manager import DataManager
+from .delivery import DeliveryPool, parse_platform_limits
+from .filters import get_regex_filter
+from .follow_feed import FollowFeedProbe
+from .outbox import Outbox
+from .profiles import ProfileCache
+from .render_cache import RenderCache
 from .renderer import Renderer
-from .utils import create_qrcode, create_render_data, image_to_base64, is_height_valid
+from .scheduler import DueQueue
+from .utils import create_qrcode, create_render_data, is_height_valid
+
+
+LOTTERY_RESULT_RE = re.compile(r"恭喜.*等\d+位同学中奖，已私信通知，详情请点击抽奖查看。")
 
 
 class DynamicListener:
@@ -29,74 +42,432 @@ class DynamicListener:
         bili_client: BiliClient,
         renderer: Renderer,
         cfg: dict,
+        profile_cache: Optional[ProfileCache] = None,
     ):
         self.context = context
         self.data_manager = data_manager
         self.bili_client = bili_client
         self.renderer = renderer
+        self.profile_cache = profile_cache
+        self._profiles_saved_at = 0.0
         self.interval_mins = self._parse_float(
             cfg.get("interval_mins"), 20, minimum=0.1
         )
         self.interval_secs = self.interval_mins * 60
         self.task_gap_secs = self._parse_float(cfg.get("task_gap_secs"), 20, minimum=0)
+        self.max_concurrency = int(
+            self._parse_float(cfg.get("max_concurrency"), 1, minimum=1)
+        )
+        # 全局请求预算：rate_limit 为每秒请求数，0 表示不启用令牌桶，改用 task_gap_secs 控制节奏
+        # 风控触发时按 BiliClient 风控控制器的系数压低速率
+        self.limiter = TokenBucket(
+            self._parse_float(cfg.get("rate_limit"), 0, minimum=0),
+            self._parse_float(cfg.get("rate_burst"), 1, minimum=1),
+            rate_scale=lambda: self.bili_client.risk.factor,
+        )
         self.rai = cfg.get("rai", True)
         self.node = cfg.get("node", False)
         self.dynamic_limit = cfg.get("dynamic_limit", 5)
-        self.render_cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
-        self.render_cache_limit = int(cfg.get("render_cache_limit", 32))
+        # 追赶补漏：第一页找不到已读位置时继续向后翻页，受页数和动态时间限制
+        self.catchup_max_pages = int(
+            self._parse_float(cfg.get("catchup_max_pages"), 3, minimum=1)
+        )
+        self.catchup_max_secs = (
+            self._parse_float(cfg.get("catchup_max_hours"), 24, minimum=0.1) * 3600
+        )
+        # 渲染结果落盘缓存，同一动态在不同会话、重启前后都只渲染一次
+        self.render_cache = RenderCache(
+            os.path.join(os.path.dirname(self.data_manager.path), "render_cache"),
+            max_entries=int(
+                self._parse_float(cfg.get("render_cache_limit"), 256, minimum=1)
+            ),
+            max_bytes=int(
+                self._parse_float(cfg.get("render_cache_max_mb"), 200, minimum=1)
+                * 1024
+                * 1024
+            ),
+            ttl_secs=self._parse_float(cfg.get("render_cache_ttl_hours"), 72, minimum=0.1)
+            * 3600,
+        )
+        self.render_flight = SingleFlight()
+        # 消息投递：各会话并发发送，按平台适配器限制并发，单个会话超时不影响其他会话
+        self.delivery = DeliveryPool(
+            context,
+            platform_concurrency=int(
+                self._parse_float(cfg.get("delivery_concurrency"), 5, minimum=1)
+            ),
+            timeout_secs=self._parse_float(
+                cfg.get("delivery_timeout_secs"), 60, minimum=0
+            ),
+            platform_limits=parse_platform_limits(
+                cfg.get("delivery_platform_limits", [])
+            ),
+        )
+        # 发件箱：检测到的通知先持久化，再由投递循环发送，重启后继续投递
+        self.outbox = Outbox(
+            os.path.join(os.path.dirname(self.data_manager.path), "outbox.db"),
+            max_attempts=int(
+                self._parse_float(cfg.get("outbox_max_attempts"), 8, minimum=1)
+            ),
+        )
+        # 直播状态独立批量轮询的周期，0 表示随 UID 任务逐个查询
+        self.live_interval_secs = self._parse_float(
+            cfg.get("live_interval_secs"), 60, minimum=0
+        )
+        self.live_batch_size = int(
+            self._parse_float(cfg.get("live_batch_size"), 100, minimum=1)
+        )
+        # 自适应轮询：按各 UID 的发布活跃度在上下限之间调整检测周期
+        self.activity_model: Optional[ActivityModel] = None
+        if cfg.get("adaptive_polling", False):
+            self.activity_model = ActivityModel(
+                os.path.join(
+                    os.path.dirname(self.data_manager.path), "poll_activity.json"
+                ),
+                base_secs=self.interval_secs,
+                min_secs=self._parse_float(cfg.get("adaptive_min_mins"), 1, minimum=0.1)
+                * 60,
+                max_secs=self._parse_float(
+                    cfg.get("adaptive_max_mins"), 120, minimum=0.1
+                )
+                * 60,
+            )
+        self._model_rebalanced_at = 0.0
+        self._model_saved_at = 0.0
+        self._targets_version = -1
+        # 因无订阅者需要而暂停拉取动态的 UID，恢复时先静默追平已读位置
+        self._dyn_paused_uids: Set[int] = set()
+        # 关注动态流探针：账号已关注的 UID 仅在探测到未知动态时才拉取完整动态列表
+        # 关注动态流模式：直接翻页拉取关注动态流并按作者分发，未关注的 UID 回退为逐个拉取
+        self.follow_feed = bool(cfg.get("follow_feed", False))
+        self.follow_feed_max_pages = int(
+            self._parse_float(cfg.get("follow_feed_max_pages"), 5, minimum=1)
+        )
+        self.follow_feed_auto_follow = bool(cfg.get("follow_feed_auto_follow", False))
+        self._follow_failed: Set[int] = set()
+        self.feed_probe: Optional[FollowFeedProbe] = None
+        if self.follow_feed or cfg.get("follow_probe", False):
+            self.feed_probe = FollowFeedProbe(
+                self.bili_client,
+                self.limiter,
+                probe_secs=self._parse_float(
+                    cfg.get("follow_probe_secs"), 30, minimum=5
+                ),
+            )
+        # 即使探针显示无更新，超过该时长未完整拉取的 UID 仍会拉取一次以防漏推
+        self.probe_full_secs = (
+            self._parse_float(cfg.get("follow_probe_full_mins"), 60, minimum=1) * 60
+        )
+        self._full_fetched_at: Dict[int, float] = {}
+        # 关注动态流与 UID 任务可能同时处理同一 UID，分发按 UID 串行，避免重复入队
+        self._uid_locks: Dict[int, asyncio.Lock] = {}
 
     async def start(self):
-        """启动后台监听循环（按 UID 任务池调度）。"""
-        uid_states: Dict[int, float] = {}
+        """启动后台监听：动态按 UID 任务池调度，直播状态按批量轮询，通知由发件箱投递。"""
+        loops = [self._dynamic_loop(), self._outbox_loop()]
+        if self.follow_feed:
+            loops.append(self._follow_feed_loop())
+        if self.live_interval_secs > 0:
+            loops.append(self._live_loop())
+        try:
+            await asyncio.gather(*loops)
+        finally:
+            # 登录、登出时会重新启动监听，这里只取消投递中的任务，发件箱留到插件卸载时关闭
+            await self.delivery.close()
+
+    async def close(self):
+        """插件卸载时调用：取消投递中的任务，关闭发件箱并写回渲染缓存索引。"""
+        await self.delivery.close()
+        self.outbox.close()
+        self.render_cache.flush()
+
+    async def _dynamic_loop(self):
+        """动态监听循环（按 UID 任务池调度）。"""
+        queue = DueQueue()
+        running: Dict[int, asyncio.Task] = {}
         next_dispatch_at = 0.0
+        synced = False
 
+        try:
+            while True:
+                try:
+                    for uid, task in list(running.items()):
+                        if not task.done():
+                            continue
+                        running.pop(uid)
+                        finished_at = task.result()
+                        if self._uid_wanted(uid):
+                            queue.schedule(uid, finished_at + self._next_interval(uid))
+                        if self.max_concurrency == 1 and not self.limiter.enabled:
+                            next_dispatch_at = finished_at + self._task_gap()
+
+                    if self.bili_client.credential is None:
+                        logger.warning(
+                            "Bilibili 凭据未设置，无法获取动态。请使用 /bili_login 登录或在配置中设置 sessdata。"
+                        )
+                        await asyncio.sleep(self.interval_secs)
+                        continue
+
+                    if not synced or self._targets_version != self.data_manager.version:
+                        self._sync_uid_targets(queue, running, full=not synced)
+                        synced = True
+                    self._maintain_activity_model()
+                    self._maintain_profile_cache()
+                    if self.feed_probe and not self.follow_feed:
+                        await self.feed_probe.refresh()
+
+                    if len(running) >= self.max_concurrency:
+                        await self._wait_running(running, None)
+                        continue
+
+                    next_due_at = queue.peek()
+                    if next_due_at is None:
+                        await self._wait_running(running, None)
+                        continue
+
+                    now = time.monotonic()
+                    wake_at = max(next_due_at, next_dispatch_at)
+                    if self.bili_client.risk.is_open():
+                        wake_at = max(wake_at, now + self.bili_client.risk.retry_after())
+                    if wake_at > now:
+                        await self._wait_running(running, wake_at - now)
+                        continue
+
+                    run_uid = queue.pop()
+                    targets = self.data_manager.get_uid_targets().get(run_uid, [])
+                    running[run_uid] = asyncio.create_task(
+                        self._run_uid_slot(run_uid, list(targets))
+                    )
+                    if not self.limiter.enabled:
+                        next_dispatch_at = now + self._task_gap()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"UID任务池调度异常: {e}\n{traceback.format_exc()}")
+                    await asyncio.sleep(1)
+        finally:
+            for task in running.values():
+                task.cancel()
+            if self.activity_model:
+                self.activity_model.save()
+            if self.profile_cache:
+                self.profile_cache.save()
+
+    def _next_interval(self, uid: int) -> float:
+        """UID 的下次检测间隔，启用自适应轮询时由活跃度模型给出。"""
+        if self.activity_model:
+            return self.activity_model.interval(uid)
+        return self.interval_secs
+
+    def _task_gap(self) -> float:
+        """未启用令牌桶时相邻任务的间隔，风控降速时相应拉长。"""
+        return self.task_gap_secs / self.bili_client.risk.factor
+
+    def _request_budget(self) -> float:
+        """全局请求预算（每秒请求数），已计入风控降速。"""
+        if self.limiter.enabled:
+            return self.limiter.effective_rate
+        if self.task_gap_secs > 0:
+            return self.max_concurrency / self._task_gap()
+        return 0
+
+    def _maintain_activity_model(self) -> None:
+        """定期按全局预算重新计算间隔放大系数，并持久化活跃度模型。"""
+        if not self.activity_model:
+            return
+        now = time.monotonic()
+        if now - self._model_rebalanced_at >= 60:
+            self._model_rebalanced_at = now
+            self.activity_model.rebalance(
+                [
+                    uid
+                    for uid in self.data_manager.get_uid_targets()
+                    if self._uid_wanted(uid)
+                ],
+                self._request_budget(),
+            )
+        if now - self._model_saved_at >= 300:
+            self._model_saved_at = now
+            self.activity_model.save()
+
+    def _maintain_profile_cache(self) -> None:
+        """定期持久化 UP 主资料，包括从动态数据更新的和命令查询时补全的。"""
+        if not self.profile_cache:
+            return
+        now = time.monotonic()
+        if now - self._profiles_saved_at >= 300:
+            self._profiles_saved_at = now
+            self.profile_cache.save()
+
+    async def _live_loop(self):
+        """直播状态监听循环：按批次查询所有需要直播通知的 UID。"""
         while True:
             try:
                 if self.bili_client.credential is None:
-                    logger.warning(
-                        "Bilibili 凭据未设置，无法获取动态。请使用 /bili_login 登录或在配置中设置 sessdata。"
-                    )
-                    await asyncio.sleep(self.interval_secs)
+                    await asyncio.sleep(self.live_interval_secs)
                     continue
 
-                uid_targets = self._build_uid_targets()
-                current_uids = set(uid_targets.keys())
-                now = time.monotonic()
-
-                for uid in list(uid_states):
-                    if uid not in current_uids:
-                        uid_states.pop(uid, None)
-
-                for uid in current_uids:
-                    uid_states.setdefault(uid, now)
-
-                if not current_uids:
-                    await asyncio.sleep(2)
+                if self.bili_client.risk.is_open():
+                    await asyncio.sleep(max(self.bili_client.risk.retry_after(), 1))
                     continue
 
-                due_uids = [uid for uid in current_uids if uid_states[uid] <= now]
-                if not due_uids:
-                    next_due_at = min(uid_states[uid] for uid in current_uids)
-                    wait_secs = min(max(next_due_at - now, 0.2), 2.0)
-                    await asyncio.sleep(wait_secs)
-                    continue
+                started_at = time.monotonic()
+                await self._poll_live_status()
+                elapsed = time.monotonic() - started_at
+                await asyncio.sleep(max(self.live_interval_secs - elapsed, 1))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"直播状态轮询异常: {e}\n{traceback.format_exc()}")
+                await asyncio.sleep(self.live_interval_secs)
+
+    async def _poll_live_status(self) -> None:
+        """分批拉取直播状态，并分发给各订阅者。"""
+        live_uids = [
+            uid
+            for uid in self.data_manager.get_uid_targets()
+            if self.data_manager.get_uid_plan(uid)["live"]
+        ]
+        for start in range(0, len(live_uids), self.live_batch_size):
+            chunk = live_uids[start : start + self.live_batch_size]
+            try:
+                await self.limiter.acquire()
+                live_rooms = await self.bili_client.get_live_info_by_uids(chunk)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"批量拉取 {len(chunk)} 个 UID 的直播状态失败: {e}\n{traceback.format_exc()}"
+                )
+                continue
+            if not live_rooms:
+                continue
 
-                if now < next_dispatch_at:
-                    wait_secs = min(max(next_dispatch_at - now, 0.2), 2.0)
-                    await asyncio.sleep(wait_secs)
+            for uid in chunk:
+                live_room = live_rooms.get(uid)
+                if not live_room:
                     continue
-
-                run_uid = min(due_uids, key=lambda uid: (uid_states[uid], uid))
-                await self._run_uid_task(run_uid, uid_targets.get(run_uid, []))
-
-                finished_at = time.monotonic()
-                uid_states[run_uid] = finished_at + self.interval_secs
-                next_dispatch_at = finished_at + self.task_gap_secs
+                targets = list(self.data_manager.get_uid_targets().get(uid, []))
+                for sub_user, sub_data in targets:
+                    if "live" in (sub_data.get("filter_types") or []):
+                        continue
+                    try:
+                        await self._handle_live_status(sub_user, sub_data, live_room)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        logger.error(
+                            f"处理订阅者 {sub_user} 的 UP主 {uid} 直播状态时发生错误: {e}\n{traceback.format_exc()}"
+                        )
+
+    async def _follow_feed_loop(self):
+        """关注动态流模式的轮询循环，一轮请求覆盖账号关注的所有 UID。"""
+        while True:
+            try:
+                if self.bili_client.credential is not None:
+                    await self._poll_follow_feed()
+                    if self.follow_feed_auto_follow:
+                        await self._follow_uncovered_uids()
             except asyncio.CancelledError:
                 raise
             except Exception as e:
-                logger.error(f"UID任务池调度异常: {e}\n{traceback.format_exc()}")
-                await asyncio.sleep(1)
+                logger.error(f"关注动态流轮询发生错误: {e}\n{traceback.format_exc()}")
+            await asyncio.sleep(self.feed_probe.probe_secs)
+
+    async def _poll_follow_feed(self) -> None:
+        """拉取关注动态流中的新动态，按作者分发给订阅者。"""
+        grouped = await self.feed_probe.collect(self.follow_feed_max_pages)
+        uid_targets = self.data_manager.get_uid_targets()
+        for uid, items in grouped.items():
+            if uid not in uid_targets or not self.data_manager.get_uid_plan(uid)["dynamics"]:
+                continue
+            if self.activity_model:
+                self.activity_model.observe(uid, items)
+            if self.profile_cache:
+                self.profile_cache.observe_items(items)
+            await self._dispatch_dynamics(uid, list(uid_targets[uid]), {"items": items})
+
+    async def _follow_uncovered_uids(self, limit: int = 5) -> None:
+        """用登录账号关注尚未关注的订阅 UID，每轮最多关注 limit 个，失败的不再重试。"""
+        followed = 0
+        for uid in list(self.data_manager.get_uid_targets()):
+            if followed >= limit:
+                break
+            if (
+                uid in self.feed_probe.followed
+                or uid in self._follow_failed
+                or not self.data_manager.get_uid_plan(uid)["dynamics"]
+            ):
+                continue
+            await self.limiter.acquire()
+            if await self.bili_client.follow_user(uid):
+                logger.info(f"已用登录账号关注 UID={uid}，其动态改由关注动态流获取")
+                self.feed_probe.mark_followed(uid)
+            else:
+                self._follow_failed.add(uid)
+            followed += 1
+
+    def _sync_uid_targets(
+        self, queue: DueQueue, running: Dict[int, asyncio.Task], full: bool = False
+    ) -> None:
+        """订阅变更后刷新调度队列，仅处理索引中发生变化的 UID。"""
+        self.data_manager.changed.clear()
+        self._targets_version = self.data_manager.version
+        changed_uids = self.data_manager.pop_changed_uids()
+        if full:
+            changed_uids |= set(self.data_manager.get_uid_targets())
+        now = time.monotonic()
+
+        uid_targets = self.data_manager.get_uid_targets()
+        for uid in changed_uids:
+            if uid not in uid_targets:
+                self._dyn_paused_uids.discard(uid)
+                self._full_fetched_at.pop(uid, None)
+                lock = self._uid_locks.get(uid)
+                if lock is not None and not lock.locked():
+                    del self._uid_locks[uid]
+                if self.activity_model:
+                    self.activity_model.forget([uid])
+            elif not self.data_manager.get_uid_plan(uid)["dynamics"]:
+                self._dyn_paused_uids.add(uid)
+
+            if not self._uid_wanted(uid):
+                queue.discard(uid)
+            elif uid not in queue and uid not in running:
+                queue.schedule(uid, now)
+
+    def _uid_wanted(self, uid: int) -> bool:
+        """该 UID 是否仍需要按 UID 任务拉取（动态，或未启用批量轮询时的直播）。"""
+        plan = self.data_manager.get_uid_plan(uid)
+        if self.live_interval_secs > 0:
+            return plan["dynamics"]
+        return plan["dynamics"] or plan["live"]
+
+    async def _wait_running(
+        self, running: Dict[int, asyncio.Task], timeout: Optional[float]
+    ) -> None:
+        """等待任一运行中的 UID 任务结束、订阅发生变更，或超时。"""
+        changed = asyncio.ensure_future(self.data_manager.changed.wait())
+        try:
+            await asyncio.wait(
+                {changed, *running.values()},
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            changed.cancel()
+
+    async def _run_uid_slot(
+        self, uid: int, targets: List[Tuple[str, Dict[str, Any]]]
+    ) -> float:
+        """在任务池中执行单个 UID 任务，返回结束时间。"""
+        try:
+            await self._run_uid_task(uid, targets)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"UID={uid} 任务执行异常: {e}\n{traceback.format_exc()}")
+        return time.monotonic()
 
     @staticmethod
     def _parse_float(value: Any, default: float, minimum: float = 0) -> float:
@@ -106,23 +477,6 @@ class DynamicListener:
             return default
         return max(parsed, minimum)
 
-    def _build_uid_targets(self) -> Dict[int, List[Tuple[str, Dict[str, Any]]]]:
-        """构建 UID -> 订阅目标列表 的映射，用于 UID 级去重请求。"""
-        uid_targets: Dict[int, List[Tuple[str, Dict[str, Any]]]] = {}
-        all_subs = self.data_manager.get_all_subscriptions()
-
-        for sub_user, sub_list in all_subs.items():
-            for sub_data in sub_list or []:
-                uid = sub_data.get("uid")
-                try:
-                    uid_int = int(uid)
-                except (TypeError, ValueError):
-                    continue
-
-                uid_targets.setdefault(uid_int, []).append((sub_user, sub_data))
-
-        return uid_targets
-
     async def _run_uid_task(
         self, uid: int, targets: List[Tuple[str, Dict[str, Any]]]
     ) -> None:
@@ -130,22 +484,39 @@ class DynamicListener:
         if not targets:
             return
 
-        try:
-            dyn = await self.bili_client.get_latest_dynamics(uid)
-        except asyncio.CancelledError:
-            raise
-        except Exception as e:
-            logger.error(f"拉取 UID={uid} 动态失败: {e}\n{traceback.format_exc()}")
-            dyn = None
+        plan = self.data_manager.get_uid_plan(uid)
+        dyn = None
+        if plan["dynamics"] and not self._probe_unchanged(uid, targets):
+            probe_ids = self.feed_probe.pending_ids(uid) if self.feed_probe else set()
+            try:
+                await self.limiter.acquire()
+                dyn = await self.bili_client.get_latest_dynamics(uid)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"拉取 UID={uid} 动态失败: {e}\n{traceback.format_exc()}")
+                dyn = None
+            if dyn:
+                self._full_fetched_at[uid] = time.monotonic()
+                if self.feed_probe:
+                    self.feed_probe.consume(uid, probe_ids)
+                if uid not in self._dyn_paused_uids:
+                    dyn = await self._catch_up(uid, targets, dyn)
+            if dyn and self.activity_model:
+                self.activity_model.observe(uid, dyn.get("items"))
+            if dyn and self.profile_cache:
+                self.profile_cache.observe_items(dyn.get("items"))
+            if dyn and uid in self._dyn_paused_uids:
+                await self._rebase_dynamics(uid, targets, dyn)
+                self._dyn_paused_uids.discard(uid)
+                dyn = None
 
-        should_check_live = any(
-            "live" not in (sub_data.get("filter_types") or [])
-            for _, sub_data in targets
-        )
         live_room = None
-        if should_check_live:
+        if plan["live"] and self.live_interval_secs <= 0:
             try:
-                live_room = await self.bili_client.get_live_info_by_uids([uid])
+                await self.limiter.acquire()
+                live_rooms = await self.bili_client.get_live_info_by_uids([uid])
+                live_room = live_rooms.get(uid) if live_rooms else None
             except asyncio.CancelledError:
                 raise
             except Exception as e:
@@ -154,69 +525,298 @@ class DynamicListener:
                 )
                 live_room = None
 
+        if dyn:
+            await self._dispatch_dynamics(uid, targets, dyn)
+
+        if not live_room:
+            return
         for sub_user, sub_data in targets:
+            if "live" in (sub_data.get("filter_types") or []):
+                continue
             try:
-                await self._check_single_up(
-                    sub_user=sub_user,
-                    sub_data=sub_data,
-                    dyn=dyn,
-                    live_room=live_room,
-                    shared_payload=True,
-                )
+                await self._handle_live_status(sub_user, sub_data, live_room)
             except asyncio.CancelledError:
                 raise
             except Exception as e:
                 logger.error(
-                    f"处理订阅者 {sub_user} 的 UP主 {sub_data.get('uid', '未知UID')} 时发生未知错误: {e}\n{traceback.format_exc()}"
+                    f"处理订阅者 {sub_user} 的 UP主 {uid} 直播状态时发生错误: {e}\n{traceback.format_exc()}"
                 )
 
-    async def _check_single_up(
-        self,
-        sub_user: str,
-        sub_data: Dict[str, Any],
-        dyn: Optional[Dict[str, Any]] = None,
-        live_room: Optional[Dict[str, Any]] = None,
-        shared_payload: bool = False,
-    ):
-        """检查单个订阅的UP主是否有更新。"""
-        uid = sub_data.get("uid")
-        if uid is None:
-            return
+    async def _dynamic_pages(self, uid: int, first: Dict) -> AsyncIterator[Dict]:
+        """从第一页开始按 offset 依次产出动态页，后续页只在被迭代到时才请求。"""
+        page = first
+        fetched = 1
+        yield page
+        while (
+            fetched < self.catchup_max_pages
+            and page.get("has_more")
+            and page.get("offset")
+        ):
+            await self.limiter.acquire()
+            page = await self.bili_client.get_latest_dynamics(uid, page["offset"])
+            if not page:
+                return
+            fetched += 1
+            yield page
 
+    @staticmethod
+    def _item_pub_ts(item: Dict[str, Any]) -> Optional[int]:
         try:
-            uid = int(uid)
-        except (TypeError, ValueError):
+            return int(item["modules"]["module_author"]["pub_ts"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _is_pinned(item: Dict[str, Any]) -> bool:
+        return ((item.get("modules") or {}).get("module_tag") or {}).get("text") == "置顶"
+
+    async def _catch_up(
+        self, uid: int, targets: List[Tuple[str, Dict[str, Any]]], dyn: Dict
+    ) -> Dict:
+        """
+        第一页中找不到某个订阅的已读位置时（两次检测之间发布过多或停机过久），继续翻页直到找到，
+        或达到页数上限、翻到早于时间上限的动态为止。仍未找到时丢弃超出时间上限的旧动态。
+        """
+        # 各订阅的已读位置：共享的最大已读 ID，以及落后订阅自己的 cursor，翻到不晚于它的动态即追上
+        state = self.data_manager.get_seen(uid)
+        positions = {state["max"]} if state and state["ids"] else set()
+        positions.update(
+            sub_data["cursor"]
+            for _, sub_data in targets
+            if sub_data.get("cursor") is not None
+        )
+        if not positions:
+            return dyn
+        position: Optional[int] = min(positions)
+
+        cutoff = time.time() - self.catchup_max_secs
+        items: List[Dict[str, Any]] = []
+        pages = 0
+        async with aclosing(self._dynamic_pages(uid, dyn)) as page_iter:
+            async for page in page_iter:
+                pages += 1
+                page_items = page.get("items") or []
+                items.extend(page_items)
+                regular = [item for item in page_items if not self._is_pinned(item)]
+                ids = [
+                    int(item["id_str"])
+                    for item in regular
+                    if str(item.get("id_str", "")).isdigit()
+                ]
+                if ids and min(ids) <= position:
+                    position = None
+                    break
+                stamps = [
+                    ts for ts in map(self._item_pub_ts, regular) if ts is not None
+                ]
+                if stamps and min(stamps) < cutoff:
+                    break
+
+        if position is not None:
+            items = [
+                item
+                for item in items
+                if self._is_pinned(item)
+                or (self._item_pub_ts(item) or cutoff) >= cutoff
+            ]
+        if pages > 1:
+            logger.info(f"UID={uid} 追赶补漏共翻阅 {pages} 页动态")
+        if pages == 1 and len(items) == len(dyn.get("items") or []):
+            return dyn
+        return dict(dyn, items=items)
+
+    def _probe_unchanged(
+        self, uid: int, targets: List[Tuple[str, Dict[str, Any]]]
+    ) -> bool:
+        """探针确认 UID 没有任何订阅未知的新动态时返回 True，可跳过本轮完整拉取。"""
+        if not self.feed_probe or uid in self._dyn_paused_uids:
+            return False
+        fetched_at = self._full_fetched_at.get(uid)
+        if fetched_at is None or time.monotonic() - fetched_at >= self.probe_full_secs:
+            return False
+        return not self.feed_probe.needs_fetch(
+            uid,
+            lambda dyn_id: any(
+                not self.data_manager.is_seen(uid, dyn_id, sub_data)
+                for _, sub_data in targets
+            ),
+        )
+
+    async def _rebase_dynamics(
+        self, uid: int, targets: List[Tuple[str, Dict[str, Any]]], dyn: Dict
+    ) -> None:
+        """暂停期间的动态不再推送，只将各订阅的已读位置追平到最新。"""
+        for sub_user, sub_data in targets:
+            items = await self._get_dynamic_items(dyn, sub_data)
+            for item in reversed(items):
+                await self.data_manager.update_last_dynamic_id(
+                    sub_user, uid, item["id_str"]
+                )
+
+    @staticmethod
+    def _filter_signature(sub_data: Dict[str, Any]) -> Tuple:
+        """过滤条件签名，签名相同的订阅对同一动态的过滤结果一致。"""
+        return (
+            frozenset(sub_data.get("filter_types") or []),
+            tuple(sub_data.get("filter_regex") or []),
+        )
+
+    async def _dispatch_dynamics(
+        self, uid: int, targets: List[Tuple[str, Dict[str, Any]]], dyn: Dict
+    ) -> None:
+        """
+        将同一 UID 的动态分发给各订阅者。
+        每条动态的渲染数据只构建一次，过滤结果按过滤条件签名复用，逐订阅者只做轻量判断。
+        待推送的动态先写入发件箱，成功后才推进各订阅的已读位置，由投递循环负责发送。
+        同一 UID 的分发串行执行，后进入的一方会按已推进的已读状态重新筛选。
+        """
+        lock = self._uid_locks.setdefault(uid, asyncio.Lock())
+        async with lock:
+            await self._dispatch_dynamics_locked(uid, targets, dyn)
+
+    async def _dispatch_dynamics_locked(
+        self, uid: int, targets: List[Tuple[str, Dict[str, Any]]], dyn: Dict
+    ) -> None:
+        renders: Dict[str, Optional[Dict[str, Any]]] = {}
+        verdicts: Dict[Tuple, bool] = {}
+        # dyn_id -> 需要推送的会话，按发布时间先后排列
+        deliveries: Dict[str, List[str]] = {}
+        advances: List[Tuple[str, List[str]]] = []
+
+        for sub_user, sub_data in targets:
+            try:
+                items = await self._get_dynamic_items(dyn, sub_data)
+                signature = self._filter_signature(sub_data)
+                sent = 0
+                seen: List[str] = []
+                for item in reversed(items):
+                    dyn_id = item["id_str"]
+                    seen.append(dyn_id)
+                    if item.get("type") not in SUPPORTED_DYNAMIC_TYPES:
+                        continue
+
+                    verdict_key = (signature, dyn_id)
+                    if verdict_key not in verdicts:
+                        verdicts[verdict_key] = self._is_dynamic_filtered(
+                            item,
+                            dyn_id,
+                            sub_data.get("filter_types") or [],
+                            sub_data.get("filter_regex") or [],
+                        )
+                    if not verdicts[verdict_key] and sent < self.dynamic_limit:
+                        if dyn_id not in renders:
+                            renders[dyn_id] = await self._build_dynamic_render_data(
+                                item, dyn_id, uid
+                            )
+                        if renders[dyn_id]:
+                            sent += 1
+                            deliveries.setdefault(dyn_id, []).append(sub_user)
+                advances.append((sub_user, seen))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"处理订阅者 {sub_user} 的 UP主 {uid} 时发生未知错误: {e}\n{traceback.format_exc()}"
+                )
+
+        try:
+            for dyn_id, sub_users in deliveries.items():
+                await self.outbox.enqueue(
+                    sub_users,
+                    "dynamic",
+                    dyn_id,
+                    f"dynamic:{dyn_id}",
+                    {"dyn_id": dyn_id, "render_data": renders[dyn_id]},
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # 未能入队时不推进已读位置，下一轮重新检测
+            logger.error(
+                f"UP主 {uid} 的新动态写入发件箱失败: {e}\n{traceback.format_exc()}"
+            )
             return
 
-        # 检查动态更新
-        if dyn is None and not shared_payload:
-            dyn = await self.bili_client.get_latest_dynamics(uid)
-        if dyn:
-            result_list = await self._parse_and_filter_dynamics(dyn, sub_data)
-            sent = 0
-            for render_data, dyn_id in reversed(result_list):
-                if render_data:
-                    if sent < self.dynamic_limit:
-                        sent += 1
-                        await self._handle_new_dynamic(sub_user, render_data, dyn_id)
+        # 处理失败的订阅先记下自己的已读位置，再推进共享的已读状态
+        advanced = {sub_user for sub_user, _ in advances}
+        for sub_user, _ in targets:
+            if sub_user not in advanced:
+                await self.data_manager.hold_cursor(sub_user, uid)
+        await self.data_manager.mark_seen(
+            uid, {dyn_id for _, seen in advances for dyn_id in seen}
+        )
+        for sub_user, seen in advances:
+            sub_data = self.data_manager.get_subscription(sub_user, uid)
+            if sub_data and sub_data.get("cursor") is not None:
+                for dyn_id in seen:
                     await self.data_manager.update_last_dynamic_id(
                         sub_user, uid, dyn_id
                     )
 
-                elif dyn_id:  # 动态被过滤，只更新ID
-                    await self.data_manager.update_last_dynamic_id(
-                        sub_user, uid, dyn_id
+    async def _outbox_loop(self):
+        """
+        投递循环：每个会话同一时间只投递队首一条，发送交给投递池并发进行。
+        各会话轮流占用平台并发名额，积压很多的会话不会饿死其他会话。
+        """
+        inflight: Set[str] = set()
+        while True:
+            try:
+                self.outbox.changed.clear()
+                heads = await self.outbox.heads(exclude=inflight)
+                for row in sorted(heads, key=lambda r: r["id"]):
+                    inflight.add(row["sub_user"])
+                    self.delivery.submit(
+                        row["sub_user"],
+                        lambda row=row: self._deliver_outbox_item(row, inflight),
                     )
 
-        # 检查直播状态
-        if "live" in sub_data.get("filter_types", []):
-            return
+                timeout = 30.0
+                next_at = await self.outbox.next_attempt_at(exclude=inflight)
+                if next_at is not None:
+                    timeout = min(max(next_at - time.time(), 0.5), timeout)
+                try:
+                    await asyncio.wait_for(self.outbox.changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"投递循环发生错误: {e}\n{traceback.format_exc()}")
+                await asyncio.sleep(5)
 
-        if live_room is None and not shared_payload:
-            # lives = await self.bili_client.get_live_info(uid)
-            live_room = await self.bili_client.get_live_info_by_uids([uid])
-        if live_room:
-            await self._handle_live_status(sub_user, sub_data, live_room)
+    async def _deliver_outbox_item(self, row: Dict[str, Any], inflight: Set[str]):
+        """发送一条发件箱记录，成功后移出队列，失败则安排重试。"""
+        sub_user = row["sub_user"]
+        try:
+            payload = await self.outbox.load_payload(row["payload_key"]) or {}
+            if row["kind"] == "dynamic":
+                ok = await self._handle_new_dynamic(
+                    sub_user, payload.get("render_data"), payload.get("dyn_id")
+                )
+            elif row["kind"] == "live":
+                ok = await self._send_live_status(
+                    sub_user,
+                    payload["uid"],
+                    payload["transition"],
+                    payload["render_data"],
+                )
+            else:
+                logger.warning(f"未知的发件箱记录类型: {row['kind']}")
+                ok = True
+            if ok:
+                await self.outbox.ack(row["id"])
+            else:
+                await self.outbox.fail(row, "发送失败")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(
+                f"投递到 {sub_user} 时发生错误: {e}\n{traceback.format_exc()}"
+            )
+            await self.outbox.fail(row, str(e))
+        finally:
+            inflight.discard(sub_user)
+            self.outbox.changed.set()
 
     def _compose_plain_dynamic(
         self, render_data: Dict[str, Any], render_fail: bool = False
@@ -231,77 +831,102 @@ class DynamicListener:
             Plain(summary),
         ]
         for pic in render_data.get("image_urls", []):
-            ls.append(Image.fromURL(pic))
+            if pic not in ASSET_PATHS:
+                ls.append(Image.fromURL(pic))
         return ls
 
     async def _send_dynamic(
         self, sub_user: str, chain_parts: list, send_node: bool = False
-    ):
+    ) -> bool:
         if self.node or send_node:
             qqNode = Node(
                 uin=0,
                 name="AstrBot",
                 content=chain_parts,
             )
-            await self.context.send_message(
+            return await self.delivery.send(
                 sub_user, MessageEventResult(chain=[qqNode])
             )
+        return await self.delivery.send(
+            sub_user, MessageEventResult(chain=chain_parts).use_t2i(False)
+        )
+
+    def _artifact_to_chain(self, artifact: Dict[str, Any]) -> list:
+        """将渲染产物转换为消息链。"""
+        if artifact["kind"] == "file":
+            ls = [File(file=artifact["path"], name=artifact["name"])]
         else:
-            await self.context.send_message(
-                sub_user, MessageEventResult(chain=chain_parts).use_t2i(False)
-            )
+            ls = [Image.fromFileSystem(artifact["path"])]
+        ls.append(Plain(f"\n{artifact.get('url', '')}"))
+        return ls
 
-    def _cache_render(self, dyn_id: Optional[str], chain_parts: list, send_node: bool):
-        """缓存渲染结果，避免同一动态在不同会话重复渲染。"""
-        if not dyn_id:
-            return
-        self.render_cache[dyn_id] = {"chain": chain_parts, "send_node": send_node}
-        while len(self.render_cache) > self.render_cache_limit:
-            self.render_cache.popitem(last=False)
+    async def _render_dynamic_artifact(
+        self, render_data: Dict[str, Any], dyn_id: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        获取动态的渲染产物，优先读取渲染缓存，未命中时渲染并写入缓存。渲染失败返回 None。
+        """
+        key = (
+            RenderCache.make_key(dyn_id, self.renderer.style, self.rai)
+            if dyn_id
+            else None
+        )
+        if not key:
+            return await self._render_and_cache(render_data, None)
+        cached = self.render_cache.get(key)
+        if cached:
+            return cached
+        # 多个会话同时请求同一动态时只渲染一次，其余等待同一结果
+        return await self.render_flight.do(
+            key, lambda: self._render_and_cache(render_data, key)
+        )
+
+    async def _render_and_cache(
+        self, render_data: Dict[str, Any], key: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        img_path = await self.renderer.render_dynamic(render_data)
+        if not img_path:
+            return None
+        artifact = {
+            "kind": "image",
+            "path": img_path,
+            "url": render_data.get("url", ""),
+            "name": "",
+        }
+        if not await is_height_valid(img_path):
+            artifact["kind"] = "file"
+            artifact["name"] = f"bilibili_dynamic_{int(time.time())}.jpg"
+        if key:
+            artifact = await self.render_cache.put(key, img_path, artifact)
+        return artifact
 
     async def _handle_new_dynamic(
         self,
         sub_user: str,
         render_data: Optional[Dict[str, Any]],
         dyn_id: Optional[str] = None,
-    ):
-        """处理并发送新的动态通知。"""
+    ) -> bool:
+        """处理并发送新的动态通知，返回是否发送成功。"""
         if not render_data:
-            return
-
-        cached = self.render_cache.get(dyn_id) if dyn_id else None
-        if cached:
-            await self._send_dynamic(sub_user, cached["chain"], cached["send_node"])
-            return
+            return True
 
-        send_node_flag = self.node
         # 非图文混合模式
         if not self.rai and render_data.get("type") in (
             "DYNAMIC_TYPE_DRAW",
             "DYNAMIC_TYPE_WORD",
         ):
             ls = self._compose_plain_dynamic(render_data)
-            await self._send_dynamic(sub_user, ls, send_node_flag)
-            self._cache_render(dyn_id, ls, send_node_flag)
-            return
+            return await self._send_dynamic(sub_user, ls, self.node)
 
-        img_path = await self.renderer.render_dynamic(render_data)
-        if img_path:
-            url = render_data.get("url", "")
-            if await is_height_valid(img_path):
-                ls = [Image.fromFileSystem(img_path)]
-            else:
-                timestamp = int(time.time())
-                filename = f"bilibili_dynamic_{timestamp}.jpg"
-                ls = [File(file=img_path, name=filename)]
-            ls.append(Plain(f"\n{url}"))
-            await self._send_dynamic(sub_user, ls, send_node_flag)
-            self._cache_render(dyn_id, ls, send_node_flag)
-            return
+        artifact = await self._render_dynamic_artifact(render_data, dyn_id)
+        if artifact:
+            return await self._send_dynamic(
+                sub_user, self._artifact_to_chain(artifact), self.node
+            )
 
         logger.error("渲染图片失败，尝试发送纯文本消息")
         ls = self._compose_plain_dynamic(render_data, render_fail=True)
-        await self._send_dynamic(sub_user, ls, send_node=True)
+        return await self._send_dynamic(sub_user, ls, send_node=True)
 
     async def _handle_live_status(self, sub_user: str, sub_data: Dict, live_room: Dict):
         """处理并发送直播状态变更通知。"""
@@ -314,43 +939,77 @@ class DynamicListener:
         link = f"https://live.bilibili.com/{room_id}"
 
         render_data = await create_render_data()
-        render_data["banner"] = await image_to_base64(BANNER_PATH)
+        render_data["banner"] = BANNER_ASSET
         render_data["name"] = "AstrBot"
-        render_data["avatar"] = await image_to_base64(LOGO_PATH)
+        render_data["avatar"] = LOGO_ASSET
         render_data["title"] = live_name
         render_data["url"] = link
         render_data["image_urls"] = [cover_url]
         # live_status: 0：未开播    1：正在直播     2：轮播中
         if live_room.get("live_status", "") == 1 and not is_live:
             render_data["text"] = f"📣 你订阅的UP 「{user_name}」 开播了！"
-            await self.data_manager.update_live_status(sub_user, sub_data["uid"], True)
-        if live_room.get("live_status", "") != 1 and is_live:
+            transition = "live_on"
+            live_since = live_room.get("live_time")
+        elif live_room.get("live_status", "") != 1 and is_live:
             render_data["text"] = f"📣 你订阅的UP 「{user_name}」 下播了！"
-            await self.data_manager.update_live_status(sub_user, sub_data["uid"], False)
-        if render_data["text"]:
+            transition = "live_off"
+            live_since = sub_data.get("live_since")
+        else:
+            return
+
+        # 先写入发件箱再更新状态，由投递循环负责渲染与发送
+        # 以本场直播的开播时间去重，状态更新失败后重复检测到同一次开播/下播时不会重复入队；
+        # 旧数据中没有开播时间的按分钟去重
+        uid = str(sub_data["uid"])
+        session = live_since or f"m{int(time.time() // 60)}"
+        ref = f"{uid}:{transition}:{session}"
+        await self.outbox.enqueue(
+            [sub_user],
+            "live",
+            ref,
+            f"live:{ref}",
+            {"uid": uid, "transition": transition, "render_data": render_data},
+        )
+        await self.data_manager.update_live_status(
+            sub_user, sub_data["uid"], transition == "live_on", live_since or None
+        )
+
+    async def _send_live_status(
+        self,
+        sub_user: str,
+        uid: str,
+        transition: Optional[str],
+        render_data: Dict[str, Any],
+    ) -> bool:
+        """渲染并发送直播状态变更通知，返回是否发送成功。"""
+        link = render_data["url"]
+
+        async def render_live():
             render_data["qrcode"] = await create_qrcode(link)
-            img_path = await self.renderer.render_dynamic(render_data)
-            if img_path:
-                await self.context.send_message(
-                    sub_user,
-                    MessageChain().file_image(img_path).message(render_data["url"]),
-                )
-            else:
-                text = "\n".join(filter(None, render_data.get("text", "").split("\n")))
-                await self.context.send_message(
-                    sub_user,
-                    MessageChain()
-                    .message("渲染图片失败了 (´;ω;`)")
-                    .message(text)
-                    .url_image(cover_url),
-                )
+            return await self.renderer.render_dynamic(render_data)
 
-    async def _get_dynamic_items(self, dyn: Dict, data: Dict):
-        """获取动态条目列表。"""
-        last = data["last"]
+        # 同一 UP 的同一次开播/下播，多个订阅会话只渲染一次
+        img_path = await self.render_flight.do(("live", uid, transition), render_live)
+        if img_path:
+            return await self.delivery.send(
+                sub_user,
+                MessageChain().file_image(img_path).message(link),
+            )
+        text = "\n".join(filter(None, render_data.get("text", "").split("\n")))
+        return await self.delivery.send(
+            sub_user,
+            MessageChain()
+            .message("渲染图片失败了 (´;ω;`)")
+            .message(text)
+            .url_image(render_data["image_urls"][0]),
+        )
+
+    async def _get_dynamic_items(
+        self, dyn: Dict, data: Dict, include_seen: bool = False
+    ):
+        """获取订阅未读的动态条目列表（新动态在前），include_seen 为 True 时不按已读状态过滤。"""
+        uid = data.get("uid")
         items = dyn["items"]
-        recent_ids = data.get("recent_ids", []) or []
-        known_ids = {x for x in ([last] + recent_ids) if x}
         new_items = []
 
         for item in items:
@@ -363,8 +1022,10 @@ class DynamicListener:
             ):
                 continue
 
-            if item["id_str"] in known_ids:
-                break
+            if not include_seen and self.data_manager.is_seen(
+                uid, item["id_str"], data
+            ):
+                continue
             new_items.append(item)
 
         return new_items
@@ -376,25 +1037,23 @@ class DynamicListener:
         if not text or not filter_regex:
             return False
 
-        for regex_pattern in filter_regex:
-            try:
-                if re.search(regex_pattern, text):
-                    logger.info(log_template.format(regex_pattern=regex_pattern))
-                    return True
-            except re.error:
-                logger.warning(f"无效的正则表达式: {regex_pattern}")
-                continue
-
-        return False
+        regex_pattern = get_regex_filter(tuple(filter_regex)).search(text)
+        if regex_pattern is None:
+            return False
+        logger.info(log_template.format(regex_pattern=regex_pattern))
+        return True
 
-    async def _parse_and_filter_dynamics(self, dyn: Dict, data: Dict):
+    async def _parse_and_filter_dynamics(
+        self, dyn: Dict, data: Dict, include_seen: bool = False
+    ):
         """
-        解析并过滤动态。
+        解析并过滤动态。include_seen 为 True 时包含已读的动态。
         """
         filter_types = data.get("filter_types", [])
         filter_regex = data.get("filter_regex", [])
         uid = data.get("uid", "")
-        items = await self._get_dynamic_items(dyn, data)  # 不含last及置顶的动态列表
+        # 不含已读及置顶的动态列表
+        items = await self._get_dynamic_items(dyn, data, include_seen)
         result_list = []
         # 无新动态
         if not items:
@@ -402,40 +1061,60 @@ class DynamicListener:
 
         for item in items:
             dyn_id = item["id_str"]
-            item_type = item.get("type")
-
-            if item_type == "DYNAMIC_TYPE_FORWARD":
-                result = await self._handle_forward_dynamic(
-                    item, dyn_id, uid, filter_types, filter_regex
-                )
-            elif item_type in ("DYNAMIC_TYPE_DRAW", "DYNAMIC_TYPE_WORD"):
-                result = await self._handle_draw_or_word_dynamic(
-                    item, dyn_id, uid, filter_types, filter_regex
-                )
-            elif item_type == "DYNAMIC_TYPE_AV":
-                result = await self._handle_video_dynamic(
-                    item, dyn_id, uid, filter_types
-                )
-            elif item_type == "DYNAMIC_TYPE_ARTICLE":
-                result = await self._handle_article_dynamic(
-                    item, dyn_id, uid, filter_types
-                )
+            if item.get("type") not in SUPPORTED_DYNAMIC_TYPES:
+                result_list.append((None, None))
+            elif self._is_dynamic_filtered(item, dyn_id, filter_types, filter_regex):
+                result_list.append((None, dyn_id))
             else:
-                result = (None, None)
-
-            result_list.append(result)
+                render_data = await self._build_dynamic_render_data(item, dyn_id, uid)
+                result_list.append((render_data, dyn_id))
 
         return result_list
 
-    async def _handle_forward_dynamic(
+    def _is_dynamic_filtered(
         self,
         item: Dict,
         dyn_id: str,
-        uid: str,
         filter_types: List[str],
         filter_regex: List[str],
-    ) -> tuple:
-        """处理转发动态的过滤与渲染数据准备。"""
+    ) -> bool:
+        """判断动态是否被订阅的过滤条件排除。"""
+        item_type = item.get("type")
+        if item_type == "DYNAMIC_TYPE_FORWARD":
+            return self._filter_forward_dynamic(item, filter_types, filter_regex)
+        if item_type in ("DYNAMIC_TYPE_DRAW", "DYNAMIC_TYPE_WORD"):
+            return self._filter_draw_or_word_dynamic(
+                item, dyn_id, filter_types, filter_regex
+            )
+        if item_type == "DYNAMIC_TYPE_AV":
+            return self._filter_video_dynamic(filter_types)
+        if item_type == "DYNAMIC_TYPE_ARTICLE":
+            return self._filter_article_dynamic(item, dyn_id, filter_types)
+        return True
+
+    async def _build_dynamic_render_data(
+        self, item: Dict, dyn_id: str, uid: Any
+    ) -> Dict[str, Any]:
+        """构建动态的渲染数据，同一动态对所有订阅者只需构建一次。"""
+        render_data = await self.renderer.build_render_data(item)
+        render_data["uid"] = uid
+        if item.get("type") != "DYNAMIC_TYPE_FORWARD":
+            return render_data
+
+        render_data["url"] = f"https://t.bilibili.com/{dyn_id}"
+        render_data["qrcode"] = await create_qrcode(render_data["url"])
+        render_forward = await self.renderer.build_render_data(
+            item.get("orig", {}), is_forward=True
+        )
+        if render_forward.get("image_urls"):
+            render_forward["image_urls"] = [render_forward["image_urls"][0]]
+        render_data["forward"] = render_forward
+        return render_data
+
+    def _filter_forward_dynamic(
+        self, item: Dict, filter_types: List[str], filter_regex: List[str]
+    ) -> bool:
+        """转发动态的过滤判断。"""
         try:
             is_forward_lottery = (
                 item["orig"]["modules"]["module_dynamic"]["major"]["opus"]["summary"][
@@ -448,59 +1127,41 @@ class DynamicListener:
 
         if "forward_lottery" in filter_types and is_forward_lottery:
             logger.info(f"转发互动抽奖在过滤列表 {filter_types} 中。")
-            return (None, dyn_id)
+            return True
 
         if "forward" in filter_types:
             logger.info(f"转发类型在过滤列表 {filter_types} 中。")
-            return (None, dyn_id)
+            return True
 
         try:
             content_text = item["modules"]["module_dynamic"]["desc"]["text"]
         except (TypeError, KeyError):
             content_text = ""
 
-        if "lottery" in filter_types and re.search(
-            r"恭喜.*等\d+位同学中奖，已私信通知，详情请点击抽奖查看。",
-            content_text,
-        ):
+        if "lottery" in filter_types and LOTTERY_RESULT_RE.search(content_text):
             logger.info(f"转发内容为抽奖在过滤列表 {filter_types} 中。")
-            return (None, dyn_id)
+            return True
 
-        if self._match_filter_regex(
+        return self._match_filter_regex(
             content_text, filter_regex, "转发内容匹配正则 {regex_pattern}。"
-        ):
-            return (None, dyn_id)
-
-        render_data = await self.renderer.build_render_data(item)
-        render_data["uid"] = uid
-        render_data["url"] = f"https://t.bilibili.com/{dyn_id}"
-        render_data["qrcode"] = await create_qrcode(render_data["url"])
-
-        render_forward = await self.renderer.build_render_data(
-            item.get("orig", {}), is_forward=True
         )
-        if render_forward.get("image_urls"):
-            render_forward["image_urls"] = [render_forward["image_urls"][0]]
-        render_data["forward"] = render_forward
-        return (render_data, dyn_id)
 
-    async def _handle_draw_or_word_dynamic(
+    def _filter_draw_or_word_dynamic(
         self,
         item: Dict,
         dyn_id: str,
-        uid: str,
         filter_types: List[str],
         filter_regex: List[str],
-    ) -> tuple:
-        """处理图文/文字动态。"""
+    ) -> bool:
+        """图文/文字动态的过滤判断。"""
         if "draw" in filter_types:
             logger.info(f"图文类型在过滤列表 {filter_types} 中。")
-            return (None, dyn_id)
+            return True
 
         major = item.get("modules", {}).get("module_dynamic", {}).get("major", {})
         if major.get("type") == "MAJOR_TYPE_BLOCKED":
             logger.info(f"图文动态 {dyn_id} 为充电专属。")
-            return (None, dyn_id)
+            return True
 
         opus = major.get("opus", {})
         summary = opus.get("summary", {})
@@ -510,44 +1171,31 @@ class DynamicListener:
 
         if first_node_text == "互动抽奖" and "lottery" in filter_types:
             logger.info(f"互动抽奖在过滤列表 {filter_types} 中。")
-            return (None, dyn_id)
+            return True
 
-        if self._match_filter_regex(
+        return self._match_filter_regex(
             summary_text,
             filter_regex,
             f"图文动态 {dyn_id} 的 summary 匹配正则 '{{regex_pattern}}'。",
-        ):
-            return (None, dyn_id)
-
-        render_data = await self.renderer.build_render_data(item)
-        render_data["uid"] = uid
-        return (render_data, dyn_id)
+        )
 
-    async def _handle_video_dynamic(
-        self, item: Dict, dyn_id: str, uid: str, filter_types: List[str]
-    ) -> tuple:
-        """处理视频动态。"""
+    def _filter_video_dynamic(self, filter_types: List[str]) -> bool:
+        """视频动态的过滤判断。"""
         if "video" in filter_types:
             logger.info(f"视频类型在过滤列表 {filter_types} 中。")
-            return (None, dyn_id)
-
-        render_data = await self.renderer.build_render_data(item)
-        render_data["uid"] = uid
-        return (render_data, dyn_id)
+            return True
+        return False
 
-    async def _handle_article_dynamic(
-        self, item: Dict, dyn_id: str, uid: str, filter_types: List[str]
-    ) -> tuple:
-        """处理专栏文章动态。"""
+    def _filter_article_dynamic(
+        self, item: Dict, dyn_id: str, filter_types: List[str]
+    ) -> bool:
+        """专栏文章动态的过滤判断。"""
         if "article" in filter_types:
             logger.info(f"文章类型在过滤列表 {filter_types} 中。")
-            return (None, dyn_id)
+            return True
 
         major = item.get("modules", {}).get("module_dynamic", {}).get("major", {})
         if major.get("type") == "MAJOR_TYPE_BLOCKED":
             logger.info(f"文章 {dyn_id} 为充电专属。")
-            return (None, dyn_id)
-
-        render_data = await self.renderer.build_render_data(item)
-        render_data["uid"] = uid
-        return (render_data, dyn_id)
+            return True
+        return False
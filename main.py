@@ -3,6 +3,7 @@ import json
 import os
 import re
 import tempfile
+import time
 from typing import List
 
 from astrbot.api import AstrBotConfig, logger
@@ -30,7 +31,10 @@ from .constant import (
     get_template_names,
 )
 from .data_manager import DataManager
+from .filters import find_invalid_patterns, get_regex_filter
 from .listener import DynamicListener
+from .profiles import ProfileCache
+from .proxy_pool import ProxyPool, parse_proxy_pool
 from .renderer import Renderer
 from .tools.bangumi import BangumiTool
 from .utils import *
@@ -46,30 +50,61 @@ class Main(Star):
         self.rai = self.cfg.get("rai", True)
         self.enable_parse_miniapp = self.cfg.get("enable_parse_miniapp", True)
         self.enable_parse_BV = self.cfg.get("enable_parse_BV", True)
+        self.parse_BV_online = self.cfg.get("parse_BV_online", True)
         self.proxy = (self.cfg.get("proxy", "") or "").strip()
+        self.transport = {
+            "client": (self.cfg.get("http_client", "") or "").strip(),
+            "http2": self.cfg.get("http2", True),
+            "pool_size": max(int(self.cfg.get("http_pool_size", 32) or 32), 1),
+            "timeout_secs": max(float(self.cfg.get("http_timeout_secs", 15) or 15), 1),
+        }
+        proxies = parse_proxy_pool(self.cfg.get("proxy_pool", []))
+        self.proxy_pool = (
+            ProxyPool(
+                proxies,
+                eject_secs=max(float(self.cfg.get("proxy_eject_secs", 120) or 120), 1),
+            )
+            if proxies
+            else None
+        )
         # 读取样式配置
         self.style = self.cfg.get("renderer_template", DEFAULT_TEMPLATE)
 
-        self.data_manager = DataManager()
+        self.data_manager = DataManager(
+            flush_secs=max(float(self.cfg.get("save_flush_secs", 2) or 0), 0),
+            backend=self.cfg.get("storage_backend", "json"),
+        )
         self.renderer = Renderer(self, self.rai, self.style)
 
         # 优先使用 DataManager 中的凭据
         saved_credential = self.data_manager.get_credential()
         if saved_credential:
             self.bili_client = BiliClient(
-                credential_dict=saved_credential, proxy=self.proxy
+                credential_dict=saved_credential,
+                proxy=self.proxy,
+                transport=self.transport,
+                proxy_pool=self.proxy_pool,
             )
         else:
             self.bili_client = BiliClient(
-                sessdata=self.cfg.get("sessdata"), proxy=self.proxy
+                sessdata=self.cfg.get("sessdata"),
+                proxy=self.proxy,
+                transport=self.transport,
+                proxy_pool=self.proxy_pool,
             )
 
+        self.profile_cache = ProfileCache(
+            os.path.join(os.path.dirname(self.data_manager.path), "profiles.json"),
+            self.bili_client,
+        )
+
         self.dynamic_listener = DynamicListener(
             context=self.context,
             data_manager=self.data_manager,
             bili_client=self.bili_client,
             renderer=self.renderer,
             cfg=self.cfg,
+            profile_cache=self.profile_cache,
         )
         self.context.add_llm_tools(BangumiTool())
         self._start_tasks()
@@ -137,10 +172,10 @@ class Main(Star):
         """登出 Bilibili，清除凭据。"""
         self.bili_client.credential = None
         await self.data_manager.clear_credential()
-        self.bili_client = BiliClient(
-            sessdata=self.cfg.get("sessdata"), proxy=self.proxy
-        )
-        self.dynamic_listener.bili_client = self.bili_client
+        # 复用现有客户端，保留连接池、缓存与风控状态，也让资料缓存等持有的引用保持有效
+        sessdata = self.cfg.get("sessdata")
+        if sessdata:
+            self.bili_client.set_credential({"sessdata": sessdata})
         self._start_tasks()
         return MessageEventResult().message("✅ 已登出 Bilibili，凭据已清除。")
 
@@ -201,7 +236,9 @@ class Main(Star):
             elif match_.group(0):
                 bvid = match_.group(0)
 
-            video_data = await self.bili_client.get_video_info(bvid=bvid)
+            video_data = await self.bili_client.get_video_info(
+                bvid=bvid, with_online=self.parse_BV_online
+            )
             if not video_data:
                 return await event.send(
                     MessageChain().message("获取视频信息失败了 (´;ω;`)")
@@ -217,9 +254,10 @@ class Main(Star):
                 f"UP 主: {info['owner']['name']}<br>"
                 f"播放量: {info['stat']['view']}<br>"
                 f"点赞: {info['stat']['like']}<br>"
-                f"投币: {info['stat']['coin']}<br>"
-                f"总共 {online['total']} 人正在观看"
+                f"投币: {info['stat']['coin']}"
             )
+            if online:
+                render_data["text"] += f"<br>总共 {online['total']} 人正在观看"
             render_data["image_urls"] = [info["pic"]]
 
             img_path = await self.renderer.render_dynamic(render_data)
@@ -249,6 +287,13 @@ class Main(Star):
         sub_user = event.unified_msg_origin
         if not uid.isdigit():
             return MessageEventResult().message("UID 格式错误")
+        invalid_regex = find_invalid_patterns(filter_regex)
+        if invalid_regex:
+            return MessageEventResult().message(
+                f"无效的正则表达式: {', '.join(invalid_regex)}"
+            )
+        # 预编译过滤器，后续轮询直接复用
+        get_regex_filter(tuple(filter_regex))
 
         # 检查是否已经存在该订阅
         if await self.data_manager.update_subscription(
@@ -261,37 +306,41 @@ class Main(Star):
             # 构造新的订阅数据结构
             _sub_data = {
                 "uid": int(uid),
-                "last": "",
                 "is_live": False,
                 "filter_types": filter_types,
                 "filter_regex": filter_regex,
-                "recent_ids": [],
             }
             # 获取最新一条动态 (用于初始化 last_id)
             dyn = await self.bili_client.get_latest_dynamics(int(uid))
             if dyn:
+                self.profile_cache.observe_items(dyn.get("items"))
                 await self.data_manager.add_subscription(sub_user, _sub_data)
-                result_list = await self.dynamic_listener._parse_and_filter_dynamics(
-                    dyn, _sub_data
+                await self.data_manager.seed_subscription(
+                    sub_user,
+                    int(uid),
+                    [item["id_str"] for item in dyn.get("items") or []],
                 )
-                for render_data, dyn_id in reversed(result_list):
-                    if dyn_id:
-                        await self.data_manager.update_last_dynamic_id(
-                            sub_user, int(uid), dyn_id
-                        )
         except Exception as e:
             logger.error(f"获取初始动态失败: {e}")
         finally:
             # 保存配置
             await self.data_manager.add_subscription(sub_user, _sub_data)
-        # 获取用户信息(可能412，故后置)
+        # 获取用户信息(可能412，故后置)，优先使用资料缓存
         try:
-            usr_info, msg = await self.bili_client.get_user_info(int(uid))
-            if usr_info:
-                mid = usr_info["mid"]
-                name = usr_info["name"]
-                sex = usr_info["sex"]
-                avatar = usr_info["face"]
+            profile = self.profile_cache.get(int(uid))
+            if profile and profile.get("sex"):
+                mid = int(uid)
+                name = profile["name"]
+                sex = profile["sex"]
+                avatar = profile["face"]
+            else:
+                usr_info, msg = await self.bili_client.get_user_info(int(uid))
+                if usr_info:
+                    mid = usr_info["mid"]
+                    name = usr_info["name"]
+                    sex = usr_info["sex"]
+                    avatar = usr_info["face"]
+                    self.profile_cache.put(mid, name, avatar, sex)
         except Exception as e:
             logger.error(f"获取用户信息失败: {e}")
 
@@ -348,9 +397,12 @@ class Main(Star):
         if not subs:
             return MessageEventResult().message("无订阅")
         else:
+            profiles = await self.profile_cache.resolve(
+                [int(sub["uid"]) for sub in subs]
+            )
             for idx, uid_sub_data in enumerate(subs):
                 uid = uid_sub_data["uid"]
-                info, _ = await self.bili_client.get_user_info(int(uid))
+                info = profiles.get(int(uid))
                 if not info:
                     ret += f"{idx + 1}. {uid} - 无法获取 UP 主信息\n"
                 else:
@@ -402,6 +454,12 @@ class Main(Star):
                 filter_types.append(arg)
             else:
                 filter_regex.append(arg)
+        invalid_regex = find_invalid_patterns(filter_regex)
+        if invalid_regex:
+            return MessageEventResult().message(
+                f"无效的正则表达式: {', '.join(invalid_regex)}"
+            )
+        get_regex_filter(tuple(filter_regex))
 
         if await self.data_manager.update_subscription(
             umo, int(uid), filter_types, filter_regex
@@ -411,24 +469,19 @@ class Main(Star):
         try:
             _sub_data = {
                 "uid": int(uid),
-                "last": "",
                 "is_live": False,
                 "filter_types": filter_types,
                 "filter_regex": filter_regex,
-                "recent_ids": [],
             }
 
             dyn = await self.bili_client.get_latest_dynamics(int(uid))
             if dyn:
                 await self.data_manager.add_subscription(umo, _sub_data)
-                result_list = await self.dynamic_listener._parse_and_filter_dynamics(
-                    dyn, _sub_data
+                await self.data_manager.seed_subscription(
+                    umo,
+                    int(uid),
+                    [item["id_str"] for item in dyn.get("items") or []],
                 )
-                for _, dyn_id in reversed(result_list):
-                    if dyn_id:
-                        await self.data_manager.update_last_dynamic_id(
-                            umo, int(uid), dyn_id
-                        )
 
             usr_info, msg = await self.bili_client.get_user_info(int(uid))
         except Exception as e:
@@ -459,6 +512,54 @@ class Main(Star):
                 ret += f"  - {uid}\n"
         return MessageEventResult().message(ret)
 
+    @permission_type(PermissionType.ADMIN)
+    @command("bili_status", alias={"运行状态"})
+    async def bili_status(self, event: AstrMessageEvent):
+        """管理员指令。查看轮询与风控状态"""
+        risk = self.bili_client.risk.state()
+        lines = [
+            "📊 运行状态：",
+            f"- 订阅UP主数: {len(self.data_manager.get_uid_targets())}",
+            f"- 请求速率系数: {risk['factor']:.0%}",
+        ]
+        if risk["circuit_open"]:
+            lines.append(f"- 风控熔断: 冷却中，剩余 {risk['retry_after_secs']:.0f} 秒")
+        else:
+            lines.append("- 风控熔断: 未触发")
+        lines.append(f"- 累计风控次数: {risk['risk_events']}")
+        if risk["last_risk_at"]:
+            last_at = time.strftime(
+                "%Y-%m-%d %H:%M:%S", time.localtime(risk["last_risk_at"])
+            )
+            lines.append(f"- 最近一次风控: {last_at} ({risk['last_reason']})")
+        outbox = await self.dynamic_listener.outbox.stats()
+        lines.append(
+            f"- 待推送消息: {outbox['depth']} 条（{outbox['sessions']} 个会话），"
+            f"最早一条已等待 {outbox['oldest_age_secs']:.0f} 秒"
+        )
+        if outbox["dead"]:
+            lines.append(f"- 放弃推送的消息: {outbox['dead']} 条")
+        for proxy in self.bili_client.proxy_stats():
+            latency = (
+                f"{proxy['latency_ms']:.0f} ms" if proxy["latency_ms"] is not None else "-"
+            )
+            status = (
+                "可用"
+                if proxy["healthy"]
+                else f"已剔除，剩余 {proxy['retry_after_secs']:.0f} 秒"
+            )
+            lines.append(
+                f"- 代理 {proxy['proxy']}: {status}，延迟 {latency}，"
+                f"请求 {proxy['requests']} 次，风控率 {proxy['risk_rate']:.0%}"
+            )
+        cache_names = {"video_info": "视频信息", "video_online": "在线人数", "b23": "短链"}
+        for name, stats in self.bili_client.cache_stats().items():
+            lines.append(
+                f"- {cache_names[name]}缓存: 命中 {stats['hits']} 次，未命中 {stats['misses']} 次"
+                f"（命中率 {stats['hit_rate']:.0%}）"
+            )
+        return MessageEventResult().message("\n".join(lines))
+
     @event_message_type(EventMessageType.ALL)
     async def parse_miniapp(self, event: AstrMessageEvent):
         if self.enable_parse_miniapp:
@@ -519,9 +620,8 @@ class Main(Star):
                 "uid": uid,
                 "filter_types": [],
                 "filter_regex": [],
-                "last": "",
-                "recent_ids": [],
             },
+            include_seen=True,
         )
 
         render_data = None
@@ -558,3 +658,6 @@ class Main(Star):
                 logger.error(
                     f"Error awaiting cancellation of dynamic_listener task: {e}"
                 )
+        await self.dynamic_listener.close()
+        await self.bili_client.close()
+        await self.data_manager.close()
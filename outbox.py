@@ -0,0 +1,218 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from astrbot.api import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sub_user TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    payload_key TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    last_error TEXT,
+    UNIQUE (sub_user, kind, ref)
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_head ON outbox (status, sub_user, id);
+CREATE TABLE IF NOT EXISTS payloads (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class Outbox:
+    """
+    持久化的待推送队列（SQLite）。
+    检测到的通知先写入队列再推进已读位置，由投递循环取出发送，成功后才删除，保证至少送达一次。
+    同一动态的渲染数据只存一份，多个会话的队列项共享引用。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = 8,
+        backoff_base_secs: float = 30,
+        backoff_max_secs: float = 1800,
+        dead_retention_secs: float = 7 * 86400,
+    ) -> None:
+        self.path = path
+        self.max_attempts = max(max_attempts, 1)
+        self.backoff_base_secs = backoff_base_secs
+        self.backoff_max_secs = backoff_max_secs
+        self.dead_retention_secs = dead_retention_secs
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(
+                "DELETE FROM outbox WHERE status = 'dead' AND created_at < ?",
+                (time.time() - self.dead_retention_secs,),
+            )
+            self._gc_payloads()
+        # 队列有新内容时置位，唤醒投递循环
+        self.changed = asyncio.Event()
+
+    async def _run(self, func, *args):
+        def call():
+            with self._lock, self._conn:
+                return func(*args)
+
+        return await asyncio.to_thread(call)
+
+    def _gc_payloads(self) -> None:
+        self._conn.execute(
+            "DELETE FROM payloads WHERE key NOT IN (SELECT payload_key FROM outbox)"
+        )
+
+    async def enqueue(
+        self,
+        sub_users: List[str],
+        kind: str,
+        ref: str,
+        payload_key: str,
+        payload: Dict[str, Any],
+    ) -> int:
+        """
+        为多个会话登记同一条通知，(sub_user, kind, ref) 相同的已有项会被忽略。返回新增的条数。
+        """
+        if not sub_users:
+            return 0
+        data = json.dumps(payload, ensure_ascii=False)
+        now = time.time()
+
+        def write():
+            self._conn.execute(
+                "INSERT OR IGNORE INTO payloads (key, data, created_at) VALUES (?, ?, ?)",
+                (payload_key, data, now),
+            )
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO outbox "
+                "(sub_user, kind, ref, payload_key, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(sub_user, kind, ref, payload_key, now, now) for sub_user in sub_users],
+            )
+            return cursor.rowcount
+
+        added = await self._run(write)
+        if added:
+            self.changed.set()
+        return added
+
+    async def heads(self, exclude: Set[str]) -> List[Dict[str, Any]]:
+        """
+        返回每个会话队首的待发送项（按会话内入队顺序），排除投递中的会话。
+        队首尚在退避等待时该会话本轮跳过，以保持会话内的推送顺序。
+        只返回元数据，推送内容由 load_payload 按需读取。
+        """
+        now = time.time()
+
+        def read():
+            rows = self._conn.execute(
+                "SELECT o.id, o.sub_user, o.kind, o.ref, o.payload_key, o.attempts, "
+                "o.next_attempt_at FROM outbox o "
+                "JOIN (SELECT MIN(id) AS id FROM outbox WHERE status = 'pending' "
+                "AND sub_user NOT IN (SELECT value FROM json_each(?)) "
+                "GROUP BY sub_user) h ON o.id = h.id "
+                "WHERE o.next_attempt_at <= ?",
+                (json.dumps(sorted(exclude)), now),
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+        return await self._run(read)
+
+    async def load_payload(self, payload_key: str) -> Optional[Dict[str, Any]]:
+        """读取队列项的推送内容，不存在时返回 None。"""
+
+        def read():
+            return self._conn.execute(
+                "SELECT data FROM payloads WHERE key = ?", (payload_key,)
+            ).fetchone()
+
+        row = await self._run(read)
+        return json.loads(row["data"]) if row else None
+
+    async def next_attempt_at(self, exclude: Set[str]) -> Optional[float]:
+        """
+        各会话队首中最早的可重试时间，排除投递中的会话；没有可等待的队首时返回 None。
+        非队首项要等队首发送后才会投递，不参与计算。
+        """
+
+        def read():
+            return self._conn.execute(
+                "SELECT MIN(o.next_attempt_at) FROM outbox o "
+                "JOIN (SELECT MIN(id) AS id FROM outbox WHERE status = 'pending' "
+                "AND sub_user NOT IN (SELECT value FROM json_each(?)) "
+                "GROUP BY sub_user) h ON o.id = h.id",
+                (json.dumps(sorted(exclude)),),
+            ).fetchone()[0]
+
+        return await self._run(read)
+
+    async def ack(self, item_id: int) -> None:
+        """发送成功，移出队列。"""
+
+        def write():
+            self._conn.execute("DELETE FROM outbox WHERE id = ?", (item_id,))
+            self._gc_payloads()
+
+        await self._run(write)
+
+    async def fail(self, item: Dict[str, Any], error: str) -> None:
+        """
+        发送失败，按指数退避安排重试；超过最大重试次数后标记为失败，不再投递。
+        """
+        attempts = item["attempts"] + 1
+        delay = min(
+            self.backoff_base_secs * (2 ** (attempts - 1)), self.backoff_max_secs
+        )
+        status = "pending" if attempts < self.max_attempts else "dead"
+        if status == "dead":
+            logger.error(
+                f"推送到 {item['sub_user']} 的 {item['kind']} {item['ref']} 已重试 {attempts} 次仍失败，放弃投递: {error}"
+            )
+
+        def write():
+            self._conn.execute(
+                "UPDATE outbox SET attempts = ?, next_attempt_at = ?, status = ?, last_error = ? "
+                "WHERE id = ?",
+                (attempts, time.time() + delay, status, error[:500], item["id"]),
+            )
+
+        await self._run(write)
+
+    async def stats(self) -> Dict[str, Any]:
+        """队列深度、最早一条的等待时长与放弃投递的条数。"""
+
+        def read():
+            depth, oldest, users = self._conn.execute(
+                "SELECT COUNT(*), MIN(created_at), COUNT(DISTINCT sub_user) "
+                "FROM outbox WHERE status = 'pending'"
+            ).fetchone()
+            dead = self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status = 'dead'"
+            ).fetchone()[0]
+            return depth, oldest, users, dead
+
+        depth, oldest, users, dead = await self._run(read)
+        return {
+            "depth": depth,
+            "sessions": users,
+            "oldest_age_secs": time.time() - oldest if oldest else 0.0,
+            "dead": dead,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
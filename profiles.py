@@ -0,0 +1,121 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from astrbot.api import logger
+
+from .bili_client import BiliClient
+
+# 批量名片接口单次最多查询的 UID 数
+CARDS_BATCH_SIZE = 50
+
+
+class ProfileCache:
+    """
+    UP 主资料（昵称、头像、性别）的持久化缓存。
+    从动态数据的 module_author 中顺带更新，缺失或过期的 UID 通过批量名片接口补全，
+    避免逐个请求易触发 412 的用户信息接口。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        bili_client: BiliClient,
+        ttl_secs: float = 7 * 86400,
+        max_concurrency: int = 3,
+    ) -> None:
+        self.path = path
+        self.bili_client = bili_client
+        self.ttl_secs = ttl_secs
+        self.max_concurrency = max(max_concurrency, 1)
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._profiles = json.load(f)
+        except Exception as e:
+            logger.warning(f"加载 UP 主资料缓存失败，将重新获取: {e}")
+            self._profiles = {}
+
+    def save(self) -> None:
+        """写回磁盘，无变更时跳过。"""
+        if not self._dirty:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._profiles, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"保存 UP 主资料缓存失败: {e}")
+
+    def get(self, uid: int) -> Optional[Dict[str, Any]]:
+        """返回未过期的资料，未命中时返回 None。"""
+        profile = self._profiles.get(str(uid))
+        if not profile or time.time() - profile.get("updated_at", 0) > self.ttl_secs:
+            return None
+        return profile
+
+    def put(
+        self, uid: int, name: str, face: str = "", sex: Optional[str] = None
+    ) -> None:
+        key = str(uid)
+        profile = self._profiles.get(key) or {}
+        if sex is None:
+            # 动态数据中没有性别，沿用已有的值
+            sex = profile.get("sex", "")
+        updated = {"name": name, "face": face, "sex": sex, "updated_at": time.time()}
+        if {k: profile.get(k) for k in ("name", "face", "sex")} != {
+            k: updated[k] for k in ("name", "face", "sex")
+        } or time.time() - profile.get("updated_at", 0) > self.ttl_secs / 2:
+            self._profiles[key] = updated
+            self._dirty = True
+
+    def observe_items(self, items: Iterable[Dict[str, Any]]) -> None:
+        """从动态条目的 module_author 更新资料。"""
+        for item in items or []:
+            author = (item.get("modules") or {}).get("module_author") or {}
+            if author.get("mid") and author.get("name"):
+                self.put(int(author["mid"]), author["name"], author.get("face", ""))
+
+    async def resolve(self, uids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        获取多个 UID 的资料：先查缓存，缺失的按批并发查询名片接口。查询失败的 UID 不出现在结果中。
+        新获取的资料只更新内存，由监听器定期写回。
+        """
+        result: Dict[int, Dict[str, Any]] = {}
+        missing: List[int] = []
+        for uid in dict.fromkeys(uids):
+            profile = self.get(uid)
+            if profile:
+                result[uid] = profile
+            else:
+                missing.append(uid)
+        if not missing:
+            return result
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(batch: List[int]):
+            async with semaphore:
+                return await self.bili_client.get_user_cards(batch)
+
+        batches = [
+            missing[i : i + CARDS_BATCH_SIZE]
+            for i in range(0, len(missing), CARDS_BATCH_SIZE)
+        ]
+        for cards in await asyncio.gather(*(fetch(batch) for batch in batches)):
+            for uid, card in (cards or {}).items():
+                self.put(
+                    uid, card.get("name", ""), card.get("face", ""), card.get("sex", "")
+                )
+                result[uid] = self._profiles[str(uid)]
+        return result
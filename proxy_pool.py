@@ -0,0 +1,204 @@
+import asyncio
+import contextvars
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from astrbot.api import logger
+
+# 当前请求应使用的代理，None 表示不经代理池路由；空字符串表示直连
+current_proxy: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "bili_current_proxy", default=None
+)
+
+# 配置中表示直连的代理池条目
+DIRECT = "direct"
+
+
+def parse_proxy_pool(entries: List[str]) -> List[str]:
+    """规范化代理池配置，去除空白与重复项，"direct" 表示直连。"""
+    proxies: List[str] = []
+    for entry in entries or []:
+        proxy = str(entry).strip()
+        if not proxy:
+            continue
+        if proxy.lower() == DIRECT:
+            proxy = ""
+        if proxy not in proxies:
+            proxies.append(proxy)
+    return proxies
+
+
+class ProxyPool:
+    """
+    代理池。
+    请求按代理的延迟与风控比例分散到各代理，同一 UID 的请求固定走同一代理；
+    触发风控或连续请求失败的代理被暂时剔除（多次剔除时冷却时间翻倍），冷却结束后重新参与分配。
+    """
+
+    def __init__(
+        self,
+        proxies: List[str],
+        eject_secs: float = 120,
+        max_eject_secs: float = 1800,
+        failure_threshold: int = 3,
+        max_pins: int = 10000,
+    ) -> None:
+        self.eject_secs = eject_secs
+        self.max_eject_secs = max_eject_secs
+        self.failure_threshold = max(failure_threshold, 1)
+        self.max_pins = max(max_pins, 1)
+        self._states: Dict[str, Dict[str, Any]] = {
+            proxy: {
+                "latency": None,
+                "requests": 0,
+                "failures": 0,
+                "risks": 0,
+                "consecutive_failures": 0,
+                "ejections": 0,
+                "ejected_until": 0.0,
+                "inflight": 0,
+                "assigned": 0,
+            }
+            for proxy in proxies
+        }
+        # UID 等路由键 -> 代理，按最近使用排序
+        self._pins: "OrderedDict[Any, str]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    @property
+    def proxies(self) -> List[str]:
+        return list(self._states)
+
+    def _healthy(self, proxy: str, now: float) -> bool:
+        return now >= self._states[proxy]["ejected_until"]
+
+    def _score(self, proxy: str) -> float:
+        state = self._states[proxy]
+        latency = state["latency"] if state["latency"] is not None else 0.5
+        risk_rate = state["risks"] / state["requests"] if state["requests"] else 0.0
+        # 分配次数按延迟加权，低延迟、低风控的代理承担更多请求
+        return latency * (1 + 10 * risk_rate) * (state["assigned"] + state["inflight"] + 1)
+
+    def acquire(self, key: Any = None) -> str:
+        """
+        为一次请求选择代理。key 不为空时沿用该键上次使用的代理，代理被剔除时重新分配。
+        所有代理都被剔除时选择最早恢复的一个。
+        """
+        now = time.monotonic()
+        proxy = self._pins.get(key) if key is not None else None
+        if proxy is None or not self._healthy(proxy, now):
+            healthy = [p for p in self._states if self._healthy(p, now)]
+            if healthy:
+                proxy = min(healthy, key=self._score)
+            else:
+                proxy = min(self._states, key=lambda p: self._states[p]["ejected_until"])
+        if key is not None:
+            self._pins[key] = proxy
+            self._pins.move_to_end(key)
+            while len(self._pins) > self.max_pins:
+                self._pins.popitem(last=False)
+        self._states[proxy]["inflight"] += 1
+        self._states[proxy]["assigned"] += 1
+        return proxy
+
+    def release(self, proxy: str) -> None:
+        state = self._states.get(proxy)
+        if state is not None:
+            state["inflight"] = max(state["inflight"] - 1, 0)
+
+    def record_success(self, proxy: str, latency: float) -> None:
+        state = self._states.get(proxy)
+        if state is None:
+            return
+        state["requests"] += 1
+        state["consecutive_failures"] = 0
+        state["ejections"] = 0
+        if state["latency"] is None:
+            state["latency"] = latency
+        else:
+            state["latency"] = state["latency"] * 0.8 + latency * 0.2
+
+    def record_failure(self, proxy: str) -> None:
+        """请求未得到响应（连接失败、超时等），连续失败达到阈值时剔除代理。"""
+        state = self._states.get(proxy)
+        if state is None:
+            return
+        state["requests"] += 1
+        state["failures"] += 1
+        state["consecutive_failures"] += 1
+        if state["consecutive_failures"] >= self.failure_threshold:
+            self._eject(proxy, f"连续 {state['consecutive_failures']} 次请求失败")
+            state["consecutive_failures"] = 0
+
+    def record_risk(self, proxy: str, reason: str) -> bool:
+        """
+        代理触发风控，立即剔除。返回是否仍有其他可用代理，没有时应由全局风控接管。
+        """
+        state = self._states.get(proxy)
+        if state is None:
+            return False
+        state["risks"] += 1
+        self._eject(proxy, f"触发风控 ({reason})")
+        now = time.monotonic()
+        return any(self._healthy(p, now) for p in self._states)
+
+    def _eject(self, proxy: str, reason: str) -> None:
+        state = self._states[proxy]
+        cooldown = min(self.eject_secs * (2 ** state["ejections"]), self.max_eject_secs)
+        state["ejections"] += 1
+        state["ejected_until"] = time.monotonic() + cooldown
+        logger.warning(f"代理 {proxy or '直连'} {reason}，暂停使用 {cooldown:.0f} 秒")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """各代理的延迟、风控比例与剔除状态。"""
+        now = time.monotonic()
+        return [
+            {
+                "proxy": proxy or DIRECT,
+                "healthy": self._healthy(proxy, now),
+                "retry_after_secs": max(state["ejected_until"] - now, 0),
+                "latency_ms": state["latency"] * 1000 if state["latency"] is not None else None,
+                "inflight": state["inflight"],
+                "requests": state["requests"],
+                "risk_rate": state["risks"] / state["requests"] if state["requests"] else 0.0,
+                "failures": state["failures"],
+            }
+            for proxy, state in self._states.items()
+        ]
+
+
+class RoutedSession:
+    """
+    包装 aiohttp 会话，按 current_proxy 为每个请求指定代理，并把延迟与连接失败反馈给代理池。
+    其余属性与方法原样转发给被包装的会话。
+    """
+
+    def __init__(self, session: Any, pool: ProxyPool) -> None:
+        self._session = session
+        self._pool = pool
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        proxy = current_proxy.get()
+        if proxy is None:
+            return await self._session.request(method, url, **kwargs)
+        kwargs["proxy"] = proxy or None
+        start = time.monotonic()
+        try:
+            resp = await self._session.request(method, url, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._pool.record_failure(proxy)
+            raise
+        if resp.status >= 500:
+            self._pool.record_failure(proxy)
+        elif resp.status < 400:
+            # 412/429 等风控状态由调用方识别后记录
+            self._pool.record_success(proxy, time.monotonic() - start)
+        return resp
@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from astrbot.api import logger
+
+
+class RenderCache:
+    """
+    磁盘上的渲染结果缓存，重启后仍可复用。
+    以 (dyn_id, 模板样式, rai) 为键保存渲染图片副本与发送所需的元数据，
+    按最近使用顺序淘汰，受条目数、总大小和过期时间约束，并负责删除被淘汰的图片文件。
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_entries: int = 256,
+        max_bytes: int = 200 * 1024 * 1024,
+        ttl_secs: float = 72 * 3600,
+        save_interval_secs: float = 60,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_entries = max(max_entries, 1)
+        self.max_bytes = max_bytes
+        self.ttl_secs = ttl_secs
+        # 命中只更新访问时间，索引按该间隔节流写回
+        self.save_interval_secs = save_interval_secs
+        self.index_path = os.path.join(cache_dir, self.INDEX_FILE)
+        # key -> {"file", "size", "created_at", "accessed_at", "artifact"}，按访问先后排列
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._total_bytes = 0
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+        self.purge_expired()
+
+    @staticmethod
+    def make_key(dyn_id: str, style: str, rai: bool) -> str:
+        return f"{dyn_id}:{style}:{int(bool(rai))}"
+
+    def _load_index(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except Exception as e:
+            logger.warning(f"加载渲染缓存索引失败，将重建缓存: {e}")
+            entries = {}
+
+        for key, entry in sorted(
+            entries.items(), key=lambda kv: kv[1].get("accessed_at", 0)
+        ):
+            if os.path.exists(self._file_path(entry["file"])):
+                self._entries[key] = entry
+                self._total_bytes += entry.get("size", 0)
+            else:
+                self._dirty = True
+
+        # 清理索引中不存在的孤立文件
+        known = {entry["file"] for entry in self._entries.values()}
+        for name in os.listdir(self.cache_dir):
+            if name != self.INDEX_FILE and name not in known:
+                self._remove_file(name)
+
+    def _save_index(self) -> None:
+        if not self._dirty:
+            return
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        except Exception as e:
+            logger.warning(f"保存渲染缓存索引失败: {e}")
+
+    def _file_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    def _remove_file(self, name: str) -> None:
+        try:
+            os.remove(self._file_path(name))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"删除渲染缓存文件 {name} 失败: {e}")
+
+    def _evict(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry.get("size", 0)
+        self._remove_file(entry["file"])
+        self._dirty = True
+
+    def purge_expired(self) -> None:
+        """删除过期条目及其图片文件。"""
+        now = time.time()
+        for key in [
+            key
+            for key, entry in self._entries.items()
+            if now - entry["created_at"] > self.ttl_secs
+        ]:
+            self._evict(key)
+        self._save_index()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        获取缓存的发送产物（其中 path 指向缓存目录内的图片），未命中或已过期时返回 None。
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.time()
+        if now - entry["created_at"] > self.ttl_secs or not os.path.exists(
+            self._file_path(entry["file"])
+        ):
+            self._evict(key)
+            self._save_index()
+            return None
+        entry["accessed_at"] = now
+        self._entries.move_to_end(key)
+        self._dirty = True
+        if time.monotonic() - self._saved_at >= self.save_interval_secs:
+            self._save_index()
+        return dict(entry["artifact"])
+
+    def flush(self) -> None:
+        """写回尚未保存的索引，插件卸载时调用。"""
+        self._save_index()
+
+    async def put(
+        self, key: str, image_path: str, artifact: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        将渲染图片复制进缓存目录并登记，返回指向缓存副本的发送产物，复制后删除渲染器的临时文件。
+        复制失败时原样返回 artifact。
+        """
+        self._evict(key)
+        _, ext = os.path.splitext(image_path)
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest() + (ext or ".jpg")
+        try:
+            await asyncio.to_thread(shutil.copyfile, image_path, self._file_path(name))
+            size = os.path.getsize(self._file_path(name))
+        except Exception as e:
+            logger.warning(f"写入渲染缓存失败: {e}")
+            self._save_index()
+            return artifact
+        try:
+            os.remove(image_path)
+        except Exception as e:
+            logger.warning(f"删除渲染临时文件 {image_path} 失败: {e}")
+
+        cached = dict(artifact, path=self._file_path(name))
+        now = time.time()
+        self._entries[key] = {
+            "file": name,
+            "size": size,
+            "created_at": now,
+            "accessed_at": now,
+            "artifact": cached,
+        }
+        self._total_bytes += size
+        self._dirty = True
+
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._evict(oldest)
+        self._save_index()
+        return dict(cached)
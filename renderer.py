@@ -6,10 +6,11 @@ from astrbot.api import logger
 from astrbot.api.all import Star
 
 from .constant import (
-    BANNER_PATH,
+    ASSET_PATHS,
+    BANNER_ASSET,
     CARD_TEMPLATES,
     DEFAULT_TEMPLATE,
-    LOGO_PATH,
+    LOGO_ASSET,
     MAX_ATTEMPTS,
     RETRY_DELAY,
     get_template_path,
@@ -39,6 +40,8 @@ class Renderer:
         # 预加载所有模板
         self._templates: Dict[str, str] = {}
         self._load_all_templates()
+        # 静态资源占位符 -> Base64，首次渲染时加载
+        self._assets: Dict[str, str] = {}
 
     def _load_all_templates(self):
         """预加载所有注册的模板"""
@@ -77,6 +80,7 @@ class Renderer:
         }
 
         tmpl = self.get_template(style)
+        render_data = await self.resolve_assets(render_data)
 
         for attempt in range(1, MAX_ATTEMPTS + 1):
             render_output = None
@@ -101,6 +105,27 @@ class Renderer:
 
         return None  # 所有尝试都失败
 
+    async def _asset(self, value: Any) -> Any:
+        if not isinstance(value, str) or value not in ASSET_PATHS:
+            return value
+        if value not in self._assets:
+            self._assets[value] = await image_to_base64(ASSET_PATHS[value])
+        return self._assets[value]
+
+    async def resolve_assets(self, render_data: Dict[str, Any]) -> Dict[str, Any]:
+        """返回将静态资源占位符替换为 Base64 后的渲染数据副本（包括转发的原动态）。"""
+        resolved = dict(render_data)
+        for field in ("banner", "avatar"):
+            if field in resolved:
+                resolved[field] = await self._asset(resolved[field])
+        if resolved.get("image_urls"):
+            resolved["image_urls"] = [
+                await self._asset(url) for url in resolved["image_urls"]
+            ]
+        if isinstance(resolved.get("forward"), dict):
+            resolved["forward"] = await self.resolve_assets(resolved["forward"])
+        return resolved
+
     async def build_render_data(
         self, item: Dict, is_forward: bool = False
     ) -> Dict[str, Any]:
@@ -109,7 +134,7 @@ class Renderer:
         is_forward: 标记是否正在处理转发动态
         """
         render_data = await create_render_data()
-        render_data["banner"] = await image_to_base64(BANNER_PATH)
+        render_data["banner"] = BANNER_ASSET
         # 用户名称、头像、挂件
         author_module = item.get("modules", {}).get("module_author") or {}
         render_data["name"] = author_module.get("name")
@@ -162,7 +187,7 @@ class Renderer:
             render_data["title"] = opus["title"]
             render_data["image_urls"] = [pic["url"] for pic in opus["pics"][:9]]
             if not render_data["image_urls"] and self.rai:
-                render_data["image_urls"] = [await image_to_base64(LOGO_PATH)]
+                render_data["image_urls"] = [LOGO_ASSET]
             if not is_forward:
                 url = f"https:{jump_url}"
                 render_data["qrcode"] = await create_qrcode(url)
@@ -0,0 +1,56 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+
+class DueQueue:
+    """
+    按到期时间排序的 UID 最小堆。
+    重新调度或移除 UID 时不修改堆，旧条目在出堆时惰性丢弃。
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int]] = []
+        self._due: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, uid: int) -> bool:
+        return uid in self._due
+
+    def schedule(self, uid: int, due_at: float) -> None:
+        """设置（或覆盖）UID 的下次到期时间。"""
+        self._due[uid] = due_at
+        heapq.heappush(self._heap, (due_at, uid))
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._compact()
+
+    def discard(self, uid: int) -> None:
+        """移除 UID，不存在时忽略。"""
+        self._due.pop(uid, None)
+
+    def due_at(self, uid: int) -> Optional[float]:
+        return self._due.get(uid)
+
+    def peek(self) -> Optional[float]:
+        """返回最早的到期时间，队列为空时返回 None。"""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop(self) -> Optional[int]:
+        """弹出最早到期的 UID，队列为空时返回 None。"""
+        self._drop_stale()
+        if not self._heap:
+            return None
+        _, uid = heapq.heappop(self._heap)
+        del self._due[uid]
+        return uid
+
+    def _drop_stale(self) -> None:
+        heap = self._heap
+        while heap and self._due.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def _compact(self) -> None:
+        self._heap = [(due_at, uid) for uid, due_at in self._due.items()]
+        heapq.heapify(self._heap)
@@ -0,0 +1,339 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from astrbot.api import logger
+
+from .constant import DEFAULT_CFG
+
+# 待写回的数据键：(sub_user, uid) 为单条订阅，(sub_user, None) 为会话的全部订阅，
+# (SEEN_KEY, uid) 为 UID 的已读状态，CREDENTIAL_KEY 为登录凭据，ALL_KEY 为全部数据
+CREDENTIAL_KEY = "credential"
+SEEN_KEY = "#seen"
+ALL_KEY = "*"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    sub_user TEXT PRIMARY KEY,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sub_user TEXT NOT NULL,
+    uid INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (sub_user, uid)
+);
+CREATE INDEX IF NOT EXISTS idx_subscriptions_uid ON subscriptions (uid);
+CREATE TABLE IF NOT EXISTS uid_seen (
+    uid INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS credentials (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _default_data() -> Dict[str, Any]:
+    return json.loads(json.dumps(DEFAULT_CFG))
+
+
+def _detach(value: Any) -> Any:
+    """复制 dict/list 结构，得到与内存数据脱离的快照；其余值不可变，直接共享。"""
+    if isinstance(value, dict):
+        return {k: _detach(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_detach(v) for v in value]
+    return value
+
+
+def _find_subscription(
+    data: Dict[str, Any], sub_user: str, uid: Any
+) -> Optional[Dict[str, Any]]:
+    for sub in (data.get("bili_sub_list") or {}).get(sub_user) or []:
+        if str(sub.get("uid")) == str(uid):
+            return sub
+    return None
+
+
+class JsonStorage:
+    """
+    单个 JSON 文件存储，每次写回整个文件。
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def load(self) -> Dict[str, Any]:
+        """
+        从 JSON 文件加载数据。如果文件不存在，则创建并使用默认配置。
+        """
+        if not os.path.exists(self.path):
+            logger.info(f"数据文件不存在，将创建于: {self.path}")
+            # 确保目录存在
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w", encoding="utf-8-sig") as f:
+                json.dump(DEFAULT_CFG, f, ensure_ascii=False, indent=4)
+            return _default_data()
+
+        with open(self.path, "r", encoding="utf-8-sig") as f:
+            return json.load(f)
+
+    def snapshot(self, data: Dict[str, Any], keys: Iterable[Any]) -> Dict[str, Any]:
+        """在事件循环内复制数据，得到一致的快照，序列化留给 write。"""
+        return _detach(data)
+
+    def write(self, snapshot: Dict[str, Any]) -> None:
+        """序列化后先写临时文件再原子替换。"""
+        content = json.dumps(snapshot, ensure_ascii=False, indent=2)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteStorage:
+    """
+    SQLite 存储，按行更新订阅与凭据，不再整体重写。
+    首次启用时自动从原有的 JSON 数据文件导入一次，导入前先经 normalize 规范化，
+    与 JSON 后端加载同一份数据的结果一致（订阅表按 (sub_user, uid) 唯一，重复订阅须先合并）。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        json_path: str,
+        normalize: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> None:
+        self.path = path
+        self.json_path = json_path
+        self.normalize = normalize
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def load(self) -> Dict[str, Any]:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        migrated = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'json_migrated'"
+        ).fetchone()
+        if not migrated:
+            self._migrate_json()
+
+        data = _default_data()
+        for sub_user, raw in self._conn.execute(
+            "SELECT sub_user, data FROM subscriptions ORDER BY id"
+        ):
+            data["bili_sub_list"].setdefault(sub_user, []).append(json.loads(raw))
+        data["uid_seen"] = {
+            str(uid): json.loads(raw)
+            for uid, raw in self._conn.execute("SELECT uid, data FROM uid_seen")
+        }
+        row = self._conn.execute("SELECT data FROM credentials WHERE id = 1").fetchone()
+        data["credential"] = json.loads(row[0]) if row else None
+        return data
+
+    def _migrate_json(self) -> None:
+        data = _default_data()
+        if os.path.exists(self.json_path):
+            try:
+                with open(self.json_path, "r", encoding="utf-8-sig") as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.error(f"读取 JSON 数据文件失败，跳过迁移: {e}")
+                return
+        if self.normalize:
+            self.normalize(data)
+        self.write(self.snapshot(data, [ALL_KEY]))
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                (str(time.time()),),
+            )
+        if os.path.exists(self.json_path):
+            logger.info(
+                f"已将订阅数据从 {self.json_path} 导入 {self.path}，原文件保留作为备份"
+            )
+
+    def snapshot(
+        self, data: Dict[str, Any], keys: Iterable[Any]
+    ) -> List[Tuple[Any, ...]]:
+        """
+        把待写回的键转换为行操作，在事件循环内完成，保证与内存数据一致。
+        行数据只复制不序列化，序列化在 write 中进行。
+        """
+        subs = data.get("bili_sub_list") or {}
+        seen = data.get("uid_seen") or {}
+        ops: List[Tuple[Any, ...]] = []
+        for key in keys:
+            if key == ALL_KEY:
+                ops.append(("reset",))
+                ops.extend(
+                    ("upsert", sub_user, sub.get("uid"), _detach(sub))
+                    for sub_user, sub_list in subs.items()
+                    for sub in sub_list or []
+                )
+                ops.extend(
+                    ("seen", int(uid), _detach(state)) for uid, state in seen.items()
+                )
+                ops.append(("credential", _detach(data.get("credential"))))
+            elif key == CREDENTIAL_KEY:
+                ops.append(("credential", _detach(data.get("credential"))))
+            else:
+                sub_user, uid = key
+                if sub_user == SEEN_KEY:
+                    state = seen.get(str(uid))
+                    ops.append(("seen", int(uid), _detach(state) if state else None))
+                    continue
+                if uid is None:
+                    ops.append(("delete_user", sub_user))
+                    ops.extend(
+                        ("upsert", sub_user, sub.get("uid"), _detach(sub))
+                        for sub in subs.get(sub_user) or []
+                    )
+                    continue
+                sub = _find_subscription(data, sub_user, uid)
+                if sub is None:
+                    ops.append(("delete", sub_user, uid))
+                else:
+                    ops.append(("upsert", sub_user, uid, _detach(sub)))
+        return ops
+
+    def write(self, ops: List[Tuple[Any, ...]]) -> None:
+        """序列化行数据并在一个事务内执行全部行操作。"""
+        now = time.time()
+        with self._conn:
+            for op in ops:
+                kind = op[0]
+                if kind == "reset":
+                    self._conn.execute("DELETE FROM subscriptions")
+                    self._conn.execute("DELETE FROM sessions")
+                    self._conn.execute("DELETE FROM uid_seen")
+                elif kind == "seen":
+                    if op[2] is None:
+                        self._conn.execute("DELETE FROM uid_seen WHERE uid = ?", (op[1],))
+                    else:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO uid_seen (uid, data) VALUES (?, ?)",
+                            (op[1], json.dumps(op[2])),
+                        )
+                elif kind == "upsert":
+                    _, sub_user, uid, sub = op
+                    raw = json.dumps(sub, ensure_ascii=False)
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO sessions (sub_user, created_at) VALUES (?, ?)",
+                        (sub_user, now),
+                    )
+                    self._conn.execute(
+                        "INSERT INTO subscriptions (sub_user, uid, data) VALUES (?, ?, ?) "
+                        "ON CONFLICT (sub_user, uid) DO UPDATE SET data = excluded.data",
+                        (sub_user, uid, raw),
+                    )
+                elif kind == "delete":
+                    self._conn.execute(
+                        "DELETE FROM subscriptions WHERE sub_user = ? AND uid = ?",
+                        (op[1], op[2]),
+                    )
+                elif kind == "delete_user":
+                    self._conn.execute(
+                        "DELETE FROM subscriptions WHERE sub_user = ?", (op[1],)
+                    )
+                elif kind == "credential":
+                    if op[1] is None:
+                        self._conn.execute("DELETE FROM credentials")
+                    else:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO credentials (id, data) VALUES (1, ?)",
+                            (json.dumps(op[1], ensure_ascii=False),),
+                        )
+            self._conn.execute(
+                "DELETE FROM sessions WHERE sub_user NOT IN "
+                "(SELECT DISTINCT sub_user FROM subscriptions)"
+            )
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class Journal:
+    """
+    高频状态更新（已读状态、直播状态）的追加日志，每行记录一条订阅字段或 UID 已读状态的新值。
+    合并进主存储前先轮换为 .1 文件，写入成功后删除；启动时按顺序重放两个文件。
+    记录的是字段的最终值，重复重放结果不变。
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.rotated_path = f"{path}.1"
+        self.records = 0
+        self._file = None
+
+    def replay(self) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
+        for path in (self.rotated_path, self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # 崩溃时可能留下写了一半的最后一行
+                        logger.warning(f"跳过无法解析的日志记录: {path}")
+        return records
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """追加一条记录并交给操作系统，落盘由 sync 负责。"""
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.records += 1
+
+    def sync(self) -> None:
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def rotate(self) -> None:
+        """
+        开始合并前调用：当前日志转为 .1 文件，之后的记录写入新日志。
+        上次合并失败留下的 .1 文件会与当前日志拼接，保持记录顺序。
+        """
+        self.close()
+        if os.path.exists(self.path):
+            if os.path.exists(self.rotated_path):
+                with open(self.path, "r", encoding="utf-8") as src, open(
+                    self.rotated_path, "a", encoding="utf-8"
+                ) as dst:
+                    dst.write(src.read())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.rotated_path)
+        self.records = 0
+
+    def discard_rotated(self) -> None:
+        """合并写入成功后删除已轮换的日志。"""
+        if os.path.exists(self.rotated_path):
+            os.remove(self.rotated_path)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,12 @@
+import os
+import sys
+import types
+
+# 插件目录按 AstrBot 加载时的包名注册，使模块内的相对导入可用
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "astrbot_plugin_bilibili"
+
+if PACKAGE not in sys.modules:
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [PLUGIN_DIR]
+    sys.modules[PACKAGE] = package
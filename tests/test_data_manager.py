@@ -0,0 +1,138 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from astrbot_plugin_bilibili import data_manager as data_manager_module
+from astrbot_plugin_bilibili.data_manager import DataManager
+
+UID = 42
+
+
+@pytest.fixture
+def make_manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(
+        data_manager_module,
+        "StarTools",
+        SimpleNamespace(get_data_dir=lambda plugin_name: str(tmp_path / "data")),
+    )
+    return DataManager
+
+
+def test_new_subscriber_does_not_mark_pending_dynamics_seen(make_manager):
+    async def run():
+        manager = make_manager(flush_secs=0)
+        await manager.add_subscription("g:A", {"uid": UID})
+        await manager.seed_subscription("g:A", UID, ["100"])
+        sub_a = manager.get_subscription("g:A", UID)
+        # 200 已发布，但还没推送给 A
+        assert not manager.is_seen(UID, "200", sub_a)
+
+        await manager.add_subscription("g:B", {"uid": UID})
+        await manager.seed_subscription("g:B", UID, ["200", "100"])
+
+        assert not manager.is_seen(UID, "200", sub_a)
+        sub_b = manager.get_subscription("g:B", UID)
+        assert sub_b["cursor"] == 200
+        assert manager.is_seen(UID, "100", sub_b)
+        assert not manager.is_seen(UID, "300", sub_b)
+        await manager.close()
+
+    asyncio.run(run())
+
+
+def test_first_subscriber_seeds_shared_state(make_manager):
+    async def run():
+        manager = make_manager(flush_secs=0)
+        await manager.add_subscription("g:A", {"uid": UID})
+        await manager.seed_subscription("g:A", UID, ["200", "100"])
+
+        sub_a = manager.get_subscription("g:A", UID)
+        assert manager.get_seen(UID)["max"] == 200
+        assert "cursor" not in sub_a
+        assert manager.is_seen(UID, "200", sub_a)
+        assert not manager.is_seen(UID, "300", sub_a)
+        await manager.close()
+
+    asyncio.run(run())
+
+
+def test_is_seen_within_window(make_manager):
+    async def run():
+        manager = make_manager(flush_secs=0)
+        await manager.add_subscription("g:A", {"uid": UID})
+        await manager.seed_subscription("g:A", UID, ["500", "300", "100"])
+
+        expected = {
+            50: True,
+            100: True,
+            200: False,
+            300: True,
+            400: False,
+            500: True,
+            600: False,
+        }
+        for num, seen in expected.items():
+            assert manager.is_seen(UID, str(num)) is seen, num
+        await manager.close()
+
+    asyncio.run(run())
+
+
+LEGACY_DATA = {
+    "bili_sub_list": {
+        "g:A": [
+            {
+                "uid": "5",
+                "is_live": True,
+                "filter_types": ["forward"],
+                "filter_regex": ["抽奖"],
+                "last": "300",
+            },
+            {"uid": 5, "cursor": 1, "last": "250"},
+        ]
+    }
+}
+
+
+def test_sqlite_migration_matches_json_backend(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    loaded = {}
+    for backend in ("json", "sqlite"):
+        data_dir = tmp_path / backend
+        data_dir.mkdir()
+        (data_dir / "astrbot_plugin_bilibili.json").write_text(
+            json.dumps(LEGACY_DATA), encoding="utf-8"
+        )
+        monkeypatch.setattr(
+            data_manager_module,
+            "StarTools",
+            SimpleNamespace(get_data_dir=lambda plugin_name, d=data_dir: str(d)),
+        )
+
+        async def run():
+            manager = DataManager(flush_secs=0, backend=backend)
+            await manager.close()
+            # 重新加载，比较落盘后的结果
+            manager = DataManager(flush_secs=0, backend=backend)
+            loaded[backend] = (
+                manager.get_subscriptions_by_user("g:A"),
+                manager.get_seen(5),
+            )
+            await manager.close()
+
+        asyncio.run(run())
+
+    assert loaded["sqlite"] == loaded["json"]
+    subs, seen = loaded["sqlite"]
+    assert subs == [
+        {
+            "uid": 5,
+            "is_live": True,
+            "filter_types": ["forward"],
+            "filter_regex": ["抽奖"],
+        }
+    ]
+    assert seen["max"] == 300
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from astrbot_plugin_bilibili.constant import BANNER_ASSET
+from astrbot_plugin_bilibili.listener import DynamicListener
+from astrbot_plugin_bilibili.renderer import Renderer
+
+
+class FakeDataManager:
+    def __init__(self, root):
+        self.path = os.path.join(str(root), "astrbot_plugin_bilibili.json")
+        self.version = 0
+        self.seen = set()
+
+    async def hold_cursor(self, sub_user, uid):
+        pass
+
+    async def mark_seen(self, uid, dyn_ids):
+        self.seen.update(dyn_ids)
+
+    def get_subscription(self, sub_user, uid):
+        return {"uid": uid}
+
+    async def update_live_status(self, sub_user, uid, is_live, live_since=None):
+        pass
+
+
+LIVE_ROOM = {
+    "live_status": 1,
+    "live_time": 1700000000,
+    "title": "直播间",
+    "uname": "UP",
+    "room_id": 3,
+    "cover_from_user": "https://i0.hdslb.com/bfs/live/cover.jpg",
+}
+
+
+def make_listener(tmp_path, **cfg):
+    bili_client = SimpleNamespace(credential=None, risk=SimpleNamespace(factor=1.0))
+    cfg.setdefault("live_interval_secs", 0)
+    return DynamicListener(
+        context=None,
+        data_manager=FakeDataManager(tmp_path),
+        bili_client=bili_client,
+        renderer=None,
+        cfg=cfg,
+    )
+
+
+def test_outbox_usable_after_restart(tmp_path):
+    async def run():
+        listener = make_listener(tmp_path)
+        # 登录、登出会取消并重新启动监听任务
+        for _ in range(2):
+            task = asyncio.create_task(listener.start())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        added = await listener.outbox.enqueue(
+            ["platform:group:1"], "dynamic", "100", "dynamic:100", {}
+        )
+        assert added == 1
+        assert len(await listener.outbox.heads(exclude=set())) == 1
+        await listener.close()
+
+    asyncio.run(run())
+
+
+def test_unsupported_dynamic_marked_seen_without_delivery(tmp_path):
+    async def run():
+        listener = make_listener(tmp_path)
+        items = [{"id_str": "200", "type": "DYNAMIC_TYPE_COMMON_SQUARE"}]
+
+        async def get_dynamic_items(dyn, sub_data):
+            return items
+
+        listener._get_dynamic_items = get_dynamic_items
+        await listener._dispatch_dynamics(
+            1, [("platform:group:1", {"uid": 1})], {"items": items}
+        )
+        assert listener.data_manager.seen == {"200"}
+        assert await listener.outbox.heads(exclude=set()) == []
+        await listener.close()
+
+    asyncio.run(run())
+
+
+def test_concurrent_dispatch_of_same_uid_is_serialized(tmp_path):
+    async def run():
+        listener = make_listener(tmp_path)
+        items = [{"id_str": "300", "type": "DYNAMIC_TYPE_WORD"}]
+        renders = []
+
+        async def get_dynamic_items(dyn, sub_data):
+            await asyncio.sleep(0)
+            seen = listener.data_manager.seen
+            return [item for item in dyn["items"] if item["id_str"] not in seen]
+
+        async def build_render_data(item, dyn_id, uid):
+            renders.append(dyn_id)
+            await asyncio.sleep(0.01)
+            return {"dyn_id": dyn_id}
+
+        listener._get_dynamic_items = get_dynamic_items
+        listener._build_dynamic_render_data = build_render_data
+        targets = [("platform:group:1", {"uid": 1})]
+        # 关注动态流与 UID 任务同时拿到同一条动态
+        await asyncio.gather(
+            listener._dispatch_dynamics(1, targets, {"items": items}),
+            listener._dispatch_dynamics(1, targets, {"items": items}),
+        )
+        assert renders == ["300"]
+        assert len(await listener.outbox.heads(exclude=set())) == 1
+        await listener.close()
+
+    asyncio.run(run())
+
+
+def test_live_payload_keeps_static_assets_out_of_outbox(tmp_path):
+    async def run():
+        listener = make_listener(tmp_path)
+        await listener._handle_live_status(
+            "platform:group:1", {"uid": 1, "is_live": False}, LIVE_ROOM
+        )
+        (head,) = await listener.outbox.heads(exclude=set())
+        payload = await listener.outbox.load_payload(head["payload_key"])
+        render_data = payload["render_data"]
+        assert render_data["banner"] == BANNER_ASSET
+        assert len(json.dumps(payload)) < 4096
+
+        # 渲染时补回静态资源
+        resolved = await Renderer(None, rai=True).resolve_assets(render_data)
+        assert resolved["banner"].startswith("data:image/png;base64,")
+        assert resolved["avatar"].startswith("data:image/png;base64,")
+        await listener.close()
+
+    asyncio.run(run())
+
+
+def test_live_transition_detected_twice_is_queued_once(tmp_path, monkeypatch):
+    async def run():
+        listener = make_listener(tmp_path)
+        sub_data = {"uid": 1, "is_live": False}
+        await listener._handle_live_status("platform:group:1", sub_data, LIVE_ROOM)
+        # 状态未能更新，下一分钟重新检测到同一次开播
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 120)
+        await listener._handle_live_status("platform:group:1", sub_data, LIVE_ROOM)
+        monkeypatch.undo()
+
+        (head,) = await listener.outbox.heads(exclude=set())
+        assert head["ref"] == "1:live_on:1700000000"
+        await listener.close()
+
+    asyncio.run(run())
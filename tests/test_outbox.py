@@ -0,0 +1,47 @@
+import asyncio
+import os
+import time
+
+from astrbot_plugin_bilibili.outbox import Outbox
+
+
+def test_next_attempt_at_only_considers_waiting_heads(tmp_path):
+    async def run():
+        outbox = Outbox(os.path.join(str(tmp_path), "outbox.db"))
+        await outbox.enqueue(["a"], "dynamic", "1", "dynamic:1", {})
+        await outbox.enqueue(["a"], "dynamic", "2", "dynamic:2", {})
+        await outbox.enqueue(["b"], "dynamic", "1", "dynamic:1", {})
+        head_a, head_b = sorted(
+            await outbox.heads(exclude=set()), key=lambda r: r["sub_user"]
+        )
+        await outbox.fail(head_b, "timeout")
+
+        # 会话 a 投递中时只等待会话 b 队首的退避时间，a 的非队首项不参与
+        next_at = await outbox.next_attempt_at(exclude={"a"})
+        assert next_at > time.time() + 10
+        assert await outbox.next_attempt_at(exclude={"a", "b"}) is None
+        assert await outbox.next_attempt_at(exclude=set()) <= time.time()
+        outbox.close()
+
+    asyncio.run(run())
+
+
+def test_heads_skip_excluded_and_waiting_sessions(tmp_path):
+    async def run():
+        outbox = Outbox(os.path.join(str(tmp_path), "outbox.db"))
+        for sub_user in ("a", "b", "c"):
+            await outbox.enqueue(
+                [sub_user], "dynamic", "1", "dynamic:1", {"dyn_id": "1"}
+            )
+        (head_c,) = [
+            row for row in await outbox.heads(exclude=set()) if row["sub_user"] == "c"
+        ]
+        await outbox.fail(head_c, "timeout")
+
+        heads = await outbox.heads(exclude={"a"})
+        assert [row["sub_user"] for row in heads] == ["b"]
+        assert "payload" not in heads[0]
+        assert await outbox.load_payload(heads[0]["payload_key"]) == {"dyn_id": "1"}
+        outbox.close()
+
+    asyncio.run(run())
@@ -0,0 +1,32 @@
+import asyncio
+import json
+import os
+
+from astrbot_plugin_bilibili.render_cache import RenderCache
+
+
+def test_put_removes_rendered_temp_file(tmp_path):
+    cache = RenderCache(str(tmp_path / "cache"))
+    image_path = tmp_path / "render.jpg"
+    image_path.write_bytes(b"jpeg")
+
+    artifact = asyncio.run(cache.put("1:default:1", str(image_path), {"kind": "image"}))
+
+    assert not image_path.exists()
+    assert os.path.exists(artifact["path"])
+    assert cache.get("1:default:1")["path"] == artifact["path"]
+
+
+def test_hit_saves_index_after_interval(tmp_path):
+    cache = RenderCache(str(tmp_path / "cache"), save_interval_secs=0)
+    image_path = tmp_path / "render.jpg"
+    image_path.write_bytes(b"jpeg")
+    asyncio.run(cache.put("1:default:1", str(image_path), {"kind": "image"}))
+    with open(cache.index_path, "r", encoding="utf-8") as f:
+        accessed_at = json.load(f)["1:default:1"]["accessed_at"]
+
+    cache.get("1:default:1")
+
+    with open(cache.index_path, "r", encoding="utf-8") as f:
+        assert json.load(f)["1:default:1"]["accessed_at"] >= accessed_at
+    assert not cache._dirty
@@ -0,0 +1,19 @@
+import json
+
+from astrbot_plugin_bilibili.storage import ALL_KEY, JsonStorage
+
+
+def test_json_snapshot_is_detached_from_live_data(tmp_path):
+    storage = JsonStorage(str(tmp_path / "data.json"))
+    data = storage.load()
+    data["bili_sub_list"]["g:A"] = [{"uid": 1, "filter_types": []}]
+
+    snapshot = storage.snapshot(data, [ALL_KEY])
+    # 序列化在线程中进行，快照之后的修改不能混入
+    data["bili_sub_list"]["g:A"][0]["filter_types"].append("forward")
+    data["bili_sub_list"]["g:B"] = []
+    storage.write(snapshot)
+
+    with open(storage.path, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["bili_sub_list"] == {"g:A": [{"uid": 1, "filter_types": []}]}